@@ -1,21 +1,89 @@
 import os
 from dotenv import load_dotenv
 
+load_dotenv()
+
 # API Config
-BASE_API_URL = "https://ghoapi.azureedge.net/api/"
+# GHO_API_URL can point the extractor at the local stand-in (utils/gho_standin_server.py)
+BASE_API_URL = os.getenv("GHO_API_URL", "https://ghoapi.azureedge.net/api/")
 HEADERS = {"Content-type": "application/json"}
 
+# Extract config
+EXTRACT_CONFIG = {
+    "page_size": 1000,  # Records per OData page ($top). Bounds peak memory per request.
+    "max_concurrency_per_host": 4,  # Requests in flight per API host (async extract)
+    "project_columns": True,  # Request only staging_schema columns via OData $select
+    "max_filter_values": 50,  # Longer list filters are split into parallel shards
+    # Landing file format: "json" (API document), "ndjson", "ndjson.gz" or
+    # "ndjson.zst" (needs the optional 'zstandard' package)
+    "landing_format": "ndjson.gz",
+    "validate_filters": True,  # Drop filter values unknown to the GHO catalog
+    "http": {
+        "pool_maxsize": 10,  # Keep-alive connections; keep >= max_concurrency_per_host
+        "timeout_seconds": 30,
+        "max_retries": 5,  # Retries for connection errors, timeouts, 429 and 5xx
+        "backoff_base_seconds": 0.5,  # Doubled per attempt, with full jitter
+        "backoff_max_seconds": 30,
+        "retry_statuses": [429, 500, 502, 503, 504],
+    },
+    # Token bucket shared by all extract processes on this host (see c_rate_limiter)
+    "rate_limit": {
+        "enabled": True,
+        "requests_per_second": 10,  # Sustained rate across every process
+        "burst": 20,  # Requests allowed back-to-back after an idle period
+    },
+}
+
+# Transform config
+TRANSFORM_CONFIG = {
+    # Polars engine used to collect the lazy transform plan: "streaming" runs it in
+    # batches (bounded memory), "in-memory" materializes it in one go
+    "engine": "streaming",
+    # Transform all pending landing files of a dataset as one query and write one
+    # staging file, instead of one query and one staging file per landing file
+    "batch_mode": True,
+    # Staging file format: "parquet", "ipc" (Arrow IPC) or "json" (list of rows)
+    "staging_format": "parquet",
+    # Worker processes for transform work units (one per dataset); None uses
+    # every core, 1 runs in-process
+    "max_workers": None,
+    # Forward only rows that are new or changed since the last staged snapshot,
+    # judged by a hash of every column except these
+    "change_detection": True,
+    "hash_exclude_columns": ["transformed_epoch"],
+    # Check rows against the dataset's staging_schema (nullability, types,
+    # VARCHAR lengths) and move failures to QUARANTINE_DATA_DIR
+    "validate_schema": True,
+    # Records per batch when streaming a JSON landing document into an NDJSON spool
+    "json_batch_size": 10000,
+    # Narrow staged columns to their staging_schema types (INTEGER -> Int32) and
+    # store low-cardinality strings as Categorical (distinct values <= ratio * rows).
+    # FLOAT stays Float64: PostgreSQL FLOAT is double precision.
+    "optimize_dtypes": True,
+    "categorical_max_ratio": 0.5,
+}
+
 # Project Dir Config
 ROOT_DIR = os.getcwd()
 LANDING_DATA_DIR = os.path.join(ROOT_DIR, "data/landing")  # raw or minimally processed
 STAGING_DATA_DIR = os.path.join(
     ROOT_DIR, "data/staging"
 )  # transformed and ready for upload/use
+QUARANTINE_DATA_DIR = os.path.join(
+    ROOT_DIR, "data/quarantine"
+)  # rows that failed staging_schema validation
+METRICS_DATA_DIR = os.path.join(ROOT_DIR, "data/metrics")  # derived metrics
 LOG_DIR = os.path.join(ROOT_DIR, "logs")
+LANDING_FILE_EXTENSIONS = (".json", ".ndjson", ".ndjson.gz", ".ndjson.zst")
+STAGING_FILE_EXTENSIONS = {"parquet": ".parquet", "ipc": ".arrow", "json": ".json"}
+STATE_DIR = os.path.join(ROOT_DIR, "data/state")  # persisted run state (watermarks)
+EXTRACT_STATE_FILE = os.path.join(STATE_DIR, "extract_state.json")
+RATE_LIMIT_STATE_FILE = os.path.join(STATE_DIR, "rate_limiter.json")
+ROW_HASH_DIR = os.path.join(STATE_DIR, "row_hashes")  # per-dataset row hash index
+SPOOL_DIR = os.path.join(ROOT_DIR, "data/spool")  # temporary NDJSON spools
 
 
 # PSQL config
-load_dotenv()
 PSQL_SERVER_PARAMS = {
     "host": os.getenv('DB_HOST'),
     "port": os.getenv('DB_PORT'),
@@ -25,12 +93,43 @@ PSQL_SERVER_PARAMS = {
     "connect_timeout": 5,
 }
 
+# Columns of a GHO fact (indicator) response, used to map the lower-case
+# staging_schema names back to the API's names for $select
+GHO_FACT_COLUMNS = [
+    "Id",
+    "IndicatorCode",
+    "SpatialDimType",
+    "SpatialDim",
+    "ParentLocationCode",
+    "TimeDimType",
+    "ParentLocation",
+    "Dim1Type",
+    "Dim1",
+    "TimeDim",
+    "Dim2Type",
+    "Dim2",
+    "Dim3Type",
+    "Dim3",
+    "DataSourceDimType",
+    "DataSourceDim",
+    "Value",
+    "NumericValue",
+    "Low",
+    "High",
+    "Comments",
+    "Date",
+    "TimeDimensionValue",
+    "TimeDimensionBegin",
+    "TimeDimensionEnd",
+]
+
 
 DATASET_CONFIG = {
     "life_expectancy_at_birth": {
         "DataFreshnessDays": 3650,
         "name": "Life expectancy at birth (years)",
         "code": "WHOSIS_000001",
+        "watermark_field": "Date",  # Only fetch records with Date >= the last seen
         "filters": {
             "SpatialDim": [  # Southern African Countries
                 "ZAF",
@@ -41,6 +140,33 @@ DATASET_CONFIG = {
                 "LSO",
             ]
         },
+        # Declarative transform, compiled once into polars expressions
+        # (c_transform_data.compile_transform_spec). Steps whose source column is
+        # missing from a landing file are skipped; column names are lower-cased last.
+        "transform": {
+            "aliases": {  # staging column: source column copied as-is
+                "country": "SpatialDim",
+                "sex": "Dim1",
+            },
+            "casts": {"NumericValue": "Float64", "TimeDim": "Int64"},  # polars dtypes
+            "datetimes": {  # column: input format, parsed to a UTC Datetime
+                "Date": "%Y-%m-%dT%H:%M:%S%.f%z",
+                "TimeDimensionBegin": "%Y-%m-%dT%H:%M:%S%z",
+                "TimeDimensionEnd": "%Y-%m-%dT%H:%M:%S%z",
+            },
+            "drop": [
+                "Dim2Type",
+                "Dim2",
+                "Dim3Type",
+                "Dim3",
+                "DataSourceDimType",
+                "DataSourceDim",
+                "Value",
+                "High",
+                "Low",
+                "SpatialDimType",
+            ],
+        },
         "sample_landing_file": "/local/home/carlydon/dev/etl_integrations_project_lydon_v2/data/landing/life_expectancy_at_birth/20241201/1319.json",
         "sample_staging_file": "/local/home/carlydon/dev/etl_integrations_project_lydon_v2/data/staging/life_expectancy_at_birth/20241201/1603.json",
         "staging_schema": {
@@ -64,12 +190,36 @@ DATASET_CONFIG = {
                 ("country", "VARCHAR(3)"),
                 ("sex", "VARCHAR(10)"),
                 ("transformed_epoch", "BIGINT"),
+                ("row_hash", "BIGINT"),  # Content hash; unchanged rows skip the UPDATE
                 ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
             ],
+            # Business key the loader upserts on, backed by a unique index (c_psql).
+            # Its columns must be non-null; the transform quarantines rows without them.
+            "natural_key": ["indicatorcode", "spatialdim", "timedim", "dim1"],
         },
     }
 }
 
+# Load config
+LOAD_CONFIG = {
+    # "copy": COPY each batch into a temp table and merge it with one
+    # INSERT ... ON CONFLICT DO UPDATE; "row": one statement per row
+    "method": "copy",
+    "copy_batch_rows": 50000,  # Rows per in-memory COPY buffer and merge
+    # Ignored when deciding whether an existing row changed (and needs an UPDATE)
+    "compare_exclude_columns": ["transformed_epoch"],
+}
+
+# Derived metrics (c_aggregate_data), updated from each transform's staged rows
+AGGREGATE_CONFIG = {
+    "enabled": True,
+    "value_column": "numericvalue",
+    "time_column": "timedim",
+    "series_columns": ["country", "sex"],  # One yearly series per combination
+    "region_columns": ["parentlocation", "sex"],  # Regional means per year
+    "rolling_window_years": 5,
+}
+
 # Schedule_tasks config
 SCHEDULE_CONFIG = {
     "start_delay_seconds": 5,
@@ -90,6 +240,36 @@ SCHEDULE_CONFIG = {
     },
 }
 
+# GHO metadata catalog (indicator codes and dimension values)
+CATALOG_CONFIG = {
+    "cache_file": os.path.join(STATE_DIR, "gho_catalog.json"),
+    "ttl_hours": 24,  # Disk and memory copies are refreshed after this
+    "memory_cache_size": 32,  # Catalog entries kept in the in-process LRU
+    "filter_dimensions": {  # Filter key: GHO dimensions holding its valid codes
+        "SpatialDim": ["COUNTRY", "REGION"],
+        "Dim1": ["SEX"],
+    },
+}
+
+# GHO API stand-in config (offline extract runs and benchmarks)
+STANDIN_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "mode": "synthetic",  # "synthetic", "record" (proxy + save) or "replay"
+    "upstream_url": "https://ghoapi.azureedge.net/api/",
+    "cassette_dir": os.path.join(ROOT_DIR, "data/cassettes"),
+    "latency_ms": 50,  # Added to every response
+    "error_rate": 0.0,  # Share of requests answered with 503 (exercises retries)
+    "max_page_size": 1000,  # Larger $top values are paged with @odata.nextLink
+}
+
+BENCHMARK_CONFIG = {
+    "indicator_codes": ["WHOSIS_000001", "WHOSIS_000002", "WHOSIS_000015"],
+    "page_size": 100,
+    "max_concurrency_per_host": 8,
+    "repeats": 3,
+}
+
 # Backup utility config
 BACKUP_CONFIG = {
     "s3": {
@@ -10,5 +10,5 @@ sys.path.append(project_root)
 from utils.run_script import run_script
 
 if __name__ == "__main__":
-    script_path = "src/etl_integrations_project_lydon/extract/c_extract_data.py"
+    script_path = "src/elt_integrations_project/extract/c_async_extract.py"
     run_script(script_path)
@@ -0,0 +1,183 @@
+import os
+import sys
+import polars as pl
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.common.c_file_lock import (  # noqa: E402
+    c_file_lock,
+)
+
+# Initialize colorama
+init(autoreset=True)
+
+
+class c_aggregate_data:
+    """
+    Derived metrics kept up to date from the rows each transform run stages.
+    A compact base (one value per id) is stored per dataset; a delta only
+    recomputes the series and regional means it touches:
+
+    - series_metrics: value per series (e.g. country and sex) and year, with a
+      rolling average over the last 'rolling_window_years' years and the
+      year-over-year delta.
+    - regional_metrics: mean value per region key (e.g. parent location and
+      sex) and year.
+    """
+
+    def __init__(self, metrics_dir=None, aggregate_config=None):
+        self.metrics_dir = metrics_dir or cfg.METRICS_DATA_DIR
+        self.config = aggregate_config or cfg.AGGREGATE_CONFIG
+        self.value_column = self.config["value_column"]
+        self.time_column = self.config["time_column"]
+        self.series_columns = self.config["series_columns"]
+        self.region_columns = self.config["region_columns"]
+        self.rolling_window_years = self.config["rolling_window_years"]
+
+    def get_path(self, dataset_name, name):
+        return os.path.join(self.metrics_dir, dataset_name, f"{name}.parquet")
+
+    def read_frame(self, dataset_name, name):
+        path = self.get_path(dataset_name, name)
+        return pl.read_parquet(path) if os.path.exists(path) else None
+
+    def write_frame(self, dataset_name, name, data):
+        path = self.get_path(dataset_name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp.{os.getpid()}"
+        data.write_parquet(temp_path, compression="zstd")
+        os.replace(temp_path, path)
+
+    def get_base_columns(self):
+        columns = ["id", *self.series_columns, *self.region_columns, self.time_column]
+        return list(dict.fromkeys(columns)) + [self.value_column]
+
+    def can_aggregate(self, data):
+        return all(col in data.columns for col in self.get_base_columns())
+
+    def compute_series_metrics(self, base):
+        series_keys = [*self.series_columns, self.time_column]
+        previous_time = pl.col(self.time_column).shift(1).over(self.series_columns)
+        previous_value = pl.col(self.value_column).shift(1).over(self.series_columns)
+        return (
+            base.group_by(series_keys)
+            .agg(pl.col(self.value_column).mean())
+            .sort(series_keys)
+            .with_columns(
+                pl.col(self.value_column)
+                .rolling_mean_by(
+                    self.time_column, window_size=f"{self.rolling_window_years}i"
+                )
+                .over(self.series_columns)
+                .alias(f"rolling_avg_{self.rolling_window_years}y"),
+                # Only against the previous calendar year; gaps give null
+                pl.when(pl.col(self.time_column) - previous_time == 1)
+                .then(pl.col(self.value_column) - previous_value)
+                .alias("yoy_delta"),
+            )
+        )
+
+    def compute_regional_metrics(self, base):
+        region_keys = [*self.region_columns, self.time_column]
+        return (
+            base.filter(pl.all_horizontal(pl.col(self.region_columns).is_not_null()))
+            .group_by(region_keys)
+            .agg(
+                pl.col(self.value_column).mean().alias("regional_mean"),
+                pl.struct(self.series_columns).n_unique().alias("series_count"),
+            )
+            .sort(region_keys)
+        )
+
+    def replace_keys(self, existing, recomputed, keys, affected):
+        if existing is None:
+            return recomputed
+        return pl.concat(
+            [existing.join(affected, on=keys, how="anti"), recomputed],
+            how="diagonal_relaxed",
+        ).sort(keys)
+
+    def update(self, dataset_name, delta):
+        """
+        Merges newly staged rows into the dataset's base and recomputes only the
+        series and regional means they affect. Returns the number of series
+        refreshed.
+        """
+        delta = delta.select(self.get_base_columns()).with_columns(
+            # Categorical codes differ between runs; store plain strings
+            pl.col(pl.Categorical).cast(pl.String)
+        )
+
+        with c_file_lock(self.get_path(dataset_name, "base")):
+            base = self.read_frame(dataset_name, "base")
+            replaced = None
+            if base is not None:
+                delta = delta.cast(base.schema, strict=False)
+                replaced = base.join(delta.select("id"), on="id", how="semi")
+                base = pl.concat(
+                    [base.join(delta.select("id"), on="id", how="anti"), delta]
+                )
+            else:
+                base = delta
+            self.write_frame(dataset_name, "base", base)
+
+            changed_rows = delta if replaced is None else pl.concat([delta, replaced])
+            affected_series = changed_rows.select(self.series_columns).unique()
+            region_keys = [*self.region_columns, self.time_column]
+            affected_regions = changed_rows.select(region_keys).unique()
+
+            series_metrics = self.compute_series_metrics(
+                base.join(affected_series, on=self.series_columns, how="semi")
+            )
+            self.write_frame(
+                dataset_name,
+                "series_metrics",
+                self.replace_keys(
+                    self.read_frame(dataset_name, "series_metrics"),
+                    series_metrics,
+                    self.series_columns,
+                    affected_series,
+                ),
+            )
+
+            regional_metrics = self.compute_regional_metrics(
+                base.join(affected_regions, on=region_keys, how="semi")
+            )
+            self.write_frame(
+                dataset_name,
+                "regional_metrics",
+                self.replace_keys(
+                    self.read_frame(dataset_name, "regional_metrics"),
+                    regional_metrics,
+                    region_keys,
+                    affected_regions,
+                ),
+            )
+
+        return affected_series.height
+
+    def rebuild(self, dataset_name):
+        """
+        Recomputes every metric from the stored base, e.g. after changing
+        rolling_window_years.
+        """
+        with c_file_lock(self.get_path(dataset_name, "base")):
+            base = self.read_frame(dataset_name, "base")
+            if base is None:
+                print(f"{Fore.YELLOW}No metrics base for {dataset_name}. Skipping.")
+                return
+            self.write_frame(
+                dataset_name, "series_metrics", self.compute_series_metrics(base)
+            )
+            self.write_frame(
+                dataset_name, "regional_metrics", self.compute_regional_metrics(base)
+            )
+        print(f"{Fore.GREEN}Rebuilt metrics for {dataset_name}")
+
+
+# Example usage
+if __name__ == "__main__":
+    aggregator = c_aggregate_data()
+    for dataset_name in cfg.DATASET_CONFIG:
+        aggregator.rebuild(dataset_name)
@@ -0,0 +1,44 @@
+import os
+import json
+import fcntl
+
+
+class c_file_lock:
+    """
+    Exclusive advisory lock on '<path>.lock', shared by every process that opens the
+    same path. Used as a context manager around read-modify-write of state files.
+    """
+
+    def __init__(self, path):
+        self.lock_path = f"{path}.lock"
+        self.lock_file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        self.lock_file = open(self.lock_path, "a")
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+        self.lock_file = None
+
+
+def read_json_file(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json_file_atomic(path, data):
+    """
+    Writes JSON to a temporary sibling and renames it over the target, so readers
+    never see a partially written file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
@@ -94,6 +94,10 @@ class c_psql:
         except Exception as e:
             self.log_action(f"Error creating table '{table_name}': {e}", level="ERROR")
             conn.rollback()
+            return
+
+        # Not caught: without this index every load of the dataset would fail
+        self.create_natural_key_index(dataset_name, conn)
 
     def alter_table_for_schema(self, dataset_name, conn):
         dataset = cfg.DATASET_CONFIG.get(dataset_name)
@@ -129,6 +133,52 @@ class c_psql:
             self.log_action(f"Error altering table '{table_name}': {e}", level="ERROR")
             conn.rollback()
 
+    def create_natural_key_index(self, dataset_name, conn):
+        dataset = cfg.DATASET_CONFIG.get(dataset_name)
+        if not dataset:
+            raise ValueError(f"Dataset '{dataset_name}' not found in config.")
+
+        schema = dataset.get("staging_schema")
+        table_name = schema.get("table_name")
+        natural_key = schema.get("natural_key")
+        if not natural_key:
+            return
+
+        # The loader's ON CONFLICT target; it needs a unique index on exactly these.
+        # Rows loaded before the index existed were matched on id, so the table
+        # can hold several rows per key: the one with the highest id is kept.
+        index_name = f"{table_name}_natural_key_idx"
+        key_match = " AND ".join(f"older.{col} = newer.{col}" for col in natural_key)
+        remove_duplicates_sql = (
+            f"DELETE FROM {table_name} AS older USING {table_name} AS newer "
+            f"WHERE {key_match} AND older.id < newer.id;"
+        )
+        create_index_sql = (
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table_name} ({', '.join(natural_key)});"
+        )
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(remove_duplicates_sql)
+                if cursor.rowcount > 0:
+                    self.log_action(
+                        f"Removed {cursor.rowcount} duplicate rows from '{table_name}'.",
+                        level="WARNING",
+                    )
+                cursor.execute(create_index_sql)
+                conn.commit()
+                self.log_action(
+                    f"Unique index '{index_name}' ensured on table '{table_name}'."
+                )
+        except Exception as e:
+            self.log_action(
+                f"Error creating index '{index_name}' on '{table_name}': {e}",
+                level="ERROR",
+            )
+            conn.rollback()
+            raise
+
     def log_action(self, message, level="INFO"):
         self.log_data.append(
             {
@@ -160,5 +210,7 @@ class c_psql:
 
 if __name__ == "__main__":
     psql = c_psql()
-    psql.create_all_tables()
-    psql.save_logs()
+    try:
+        psql.create_all_tables()
+    finally:
+        psql.save_logs()
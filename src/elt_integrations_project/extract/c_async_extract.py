@@ -0,0 +1,215 @@
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.extract.c_extract_data import (  # noqa: E402
+    c_extract_data,
+    create_catalog,
+    create_http_client,
+)
+from src.elt_integrations_project.extract.c_state_store import (  # noqa: E402
+    c_state_store,
+)
+
+# Initialize colorama
+init(autoreset=True)
+
+
+class c_async_extract:
+    """
+    Extracts every configured indicator concurrently. Pages are fetched with the
+    blocking c_extract_data.fetch_page in worker threads, while a semaphore per host
+    caps how many requests are in flight against any one server.
+    """
+
+    def __init__(self, extractor, max_concurrency_per_host=4):
+        self.extractor = extractor
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.host_semaphores = {}
+
+    def get_host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(
+                self.max_concurrency_per_host
+            )
+        return self.host_semaphores[host]
+
+    async def call_with_host_limit(self, url, func, *args):
+        async with self.get_host_semaphore(url):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, func, *args)
+
+    async def fetch_page(self, url, params):
+        return await self.call_with_host_limit(
+            url, self.extractor.fetch_page, url, params
+        )
+
+    async def extract_shard(self, indicator_key, writer, url, params):
+        """
+        Lands every page of one filter shard and returns its validators.
+        """
+        # The first page asks for the total count so the remaining pages can be
+        # requested all at once instead of one after the other.
+        first_params = dict(params, **{"$count": "true"})
+        payload, validators = await self.call_with_host_limit(
+            url, self.extractor.fetch_first_page, indicator_key, url, first_params
+        )
+        if payload is None:
+            return validators
+
+        page = payload.get("value", [])
+        writer.write_page(page)
+        page_count = bool(page)
+
+        total_count = payload.get("@odata.count")
+        next_link = payload.get("@odata.nextLink")
+
+        if total_count is not None and page:
+            # The server may cap $top, so step by the rows it actually returned
+            step = len(page)
+            record_count = len(page)
+            skips = range(step, int(total_count), step)
+            pending = [
+                asyncio.ensure_future(
+                    self.fetch_page(url, dict(params, **{"$skip": skip}))
+                )
+                for skip in skips
+            ]
+            try:
+                for future in asyncio.as_completed(pending):
+                    payload = await future
+                    page = payload.get("value", [])
+                    writer.write_page(page)
+                    record_count += len(page)
+                    page_count += bool(page)
+            finally:
+                for future in pending:
+                    future.cancel()
+            if record_count < int(total_count):
+                raise ValueError(
+                    f"Received {record_count} of {total_count} records for {indicator_key}"
+                )
+        elif next_link:
+            # Without a count the server-driven links have to be followed in order
+            while next_link:
+                payload = await self.fetch_page(next_link, None)
+                page = payload.get("value", [])
+                writer.write_page(page)
+                page_count += bool(page)
+                next_link = payload.get("@odata.nextLink")
+        elif page:
+            # The server may cap $top, so only an empty page ends the shard
+            skip = len(page)
+            while page:
+                payload = await self.fetch_page(url, dict(params, **{"$skip": skip}))
+                page = payload.get("value", [])
+                writer.write_page(page)
+                page_count += bool(page)
+                skip += len(page)
+
+        self.extractor.set_single_page(validators, page_count <= 1)
+        return validators
+
+    async def extract_indicator(self, indicator_key):
+        shard_requests = self.extractor.build_requests(indicator_key)
+
+        writer = self.extractor.open_landing_writer(indicator_key)
+        try:
+            # Writes happen on the event loop thread, so shards share the writer
+            shard_validators = await asyncio.gather(
+                *[
+                    self.extract_shard(indicator_key, writer, url, params)
+                    for url, params in shard_requests
+                ]
+            )
+            validators = {}
+            for shard in shard_validators:
+                validators.update(shard)
+
+            output_file = self.extractor.close_landing_writer(
+                indicator_key, writer, validators
+            )
+        except Exception:
+            writer.abort()
+            raise
+
+        if output_file is None:
+            print(f"{Fore.CYAN}No new or changed data for {indicator_key}. Skipping.")
+            return None
+
+        print(
+            f"{Fore.GREEN}Data for {indicator_key} saved to {output_file} ({writer.record_count} records){Fore.RESET}"
+        )
+        return output_file
+
+    async def extract_all(self, indicator_keys=None):
+        """
+        Extracts the given indicators (default: all of DATASET_CONFIG) concurrently.
+        Returns a dict of indicator key to landing file (None when unchanged), or to
+        the raised exception for indicators that failed, so one bad indicator does
+        not stop the others.
+        """
+        if indicator_keys is None:
+            indicator_keys = list(self.extractor.dataset_config)
+
+        # Enough worker threads that the per-host cap, not the pool, is the limit
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrency_per_host)
+        )
+
+        results = await asyncio.gather(
+            *[self.extract_indicator(key) for key in indicator_keys],
+            return_exceptions=True,
+        )
+
+        for key, result in zip(indicator_keys, results):
+            if isinstance(result, Exception):
+                print(f"{Fore.RED}Error extracting {key}: {str(result)}")
+
+        return dict(zip(indicator_keys, results))
+
+    def run(self, indicator_keys=None):
+        start_time = time.time()
+        results = asyncio.run(self.extract_all(indicator_keys))
+        print(
+            f"{Fore.CYAN}Extracted {len(results)} indicator(s) in {time.time() - start_time:.2f}s"
+        )
+        return results
+
+
+# Main block to run the extractor if executed as a
+# script
+if __name__ == "__main__":
+    http_client = create_http_client()
+    extractor = c_extract_data(
+        dataset_config=cfg.DATASET_CONFIG,
+        base_url=cfg.BASE_API_URL,
+        headers=cfg.HEADERS,
+        output_dir=cfg.LANDING_DATA_DIR,
+        page_size=cfg.EXTRACT_CONFIG["page_size"],
+        http_client=http_client,
+        state_store=c_state_store(),
+        project_columns=cfg.EXTRACT_CONFIG["project_columns"],
+        max_filter_values=cfg.EXTRACT_CONFIG["max_filter_values"],
+        landing_format=cfg.EXTRACT_CONFIG["landing_format"],
+        catalog=(
+            create_catalog(http_client)
+            if cfg.EXTRACT_CONFIG["validate_filters"]
+            else None
+        ),
+    )
+    async_extractor = c_async_extract(
+        extractor,
+        max_concurrency_per_host=cfg.EXTRACT_CONFIG["max_concurrency_per_host"],
+    )
+    results = async_extractor.run()
+
+    if any(isinstance(result, Exception) for result in results.values()):
+        sys.exit(1)
@@ -1,24 +1,223 @@
 import sys
-import requests
 import os
+import io
 import json
+import gzip
 import time
-from datetime import datetime
+import hashlib
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from colorama import Fore, init
 
 sys.path.append(os.getcwd())
 from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.extract.c_http_client import (  # noqa: E402
+    c_http_client,
+)
+from src.elt_integrations_project.extract.c_rate_limiter import (  # noqa: E402
+    create_rate_limiter,
+)
+from src.elt_integrations_project.extract.c_state_store import (  # noqa: E402
+    c_state_store,
+)
+from src.elt_integrations_project.extract.c_gho_catalog import (  # noqa: E402
+    c_gho_catalog,
+)
 
 # Initialize colorama
 init(autoreset=True)
 
 
+def parse_watermark(value):
+    """
+    Returns a comparable watermark: numbers as-is, ISO timestamps as timezone-aware
+    datetimes (naive values are taken as UTC).
+    """
+    if value is None or isinstance(value, (int, float, datetime)):
+        return value
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_odata_literal(value):
+    """
+    Formats a scalar for an OData $filter. Timestamps and numbers are unquoted
+    literals, anything else is a quoted string.
+    """
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if isinstance(value, (int, float)):
+        return str(value)
+    return f"'{value}'"
+
+
+def open_text_writer(file_path, landing_format):
+    """
+    Opens a text stream for the landing format: plain for 'json'/'ndjson', or
+    compressed for 'ndjson.gz'/'ndjson.zst' (the latter needs 'zstandard').
+    """
+    if landing_format in ("json", "ndjson"):
+        return open(file_path, "w", encoding="utf-8")
+    if landing_format == "ndjson.gz":
+        return gzip.open(file_path, "wt", encoding="utf-8", compresslevel=6)
+    if landing_format == "ndjson.zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                f"{Fore.RED}The 'ndjson.zst' landing format needs the 'zstandard' package: pip3 install zstandard{Fore.RESET}"
+            )
+        raw_file = open(file_path, "wb")
+        return io.TextIOWrapper(
+            zstandard.ZstdCompressor().stream_writer(raw_file), encoding="utf-8"
+        )
+    raise ValueError(
+        f"{Fore.RED}Unknown landing format '{landing_format}'.{Fore.RESET}"
+    )
+
+
+class c_landing_writer:
+    """
+    Streams records into a landing file as pages arrive. Records go to a '.part'
+    file which is only moved to its final name on close, so the transform never
+    picks up a half-written landing file. Neither file ever replaces an existing
+    one: a name taken earlier in the same minute gets a '_<n>' suffix. 'json'
+    writes the API's {"value": [...]} document; the 'ndjson' formats write one
+    compact record per line, optionally gzip or zstd compressed.
+    """
+
+    def __init__(
+        self, output_file, watermark_field=None, dedup_field=None, landing_format="json"
+    ):
+        self.base_output_file = output_file
+        self.landing_format = landing_format
+        self.suffix = 0
+        self.output_file, self.partial_file = self.reserve_partial_file()
+        self.watermark_field = watermark_field
+        self.max_watermark = None
+        # Records from overlapping shards or pages are only written once
+        self.dedup_field = dedup_field
+        self.seen_keys = set()
+        self.record_count = 0
+        self.duplicate_count = 0
+        # Order-independent sum of per-record digests, so pages landed out of
+        # order (async, shards) still hash the same for the same content
+        self.hash_sum = 0
+        self.file = open_text_writer(self.partial_file, landing_format)
+        if self.landing_format == "json":
+            self.file.write('{"value": [\n')
+
+    def write_page(self, page):
+        for record in page:
+            if self.dedup_field and record.get(self.dedup_field) is not None:
+                key = record[self.dedup_field]
+                if key in self.seen_keys:
+                    self.duplicate_count += 1
+                    continue
+                self.seen_keys.add(key)
+
+            line = json.dumps(record, separators=(",", ":"))
+            if self.landing_format == "json":
+                if self.record_count:
+                    self.file.write(",\n")
+                self.file.write(line)
+            else:
+                self.file.write(f"{line}\n")
+            self.record_count += 1
+
+            digest = hashlib.blake2b(line.encode("utf-8"), digest_size=16).digest()
+            self.hash_sum = (self.hash_sum + int.from_bytes(digest, "big")) % 2**128
+
+            if self.watermark_field:
+                watermark = parse_watermark(record.get(self.watermark_field))
+                if watermark is not None and (
+                    self.max_watermark is None or watermark > self.max_watermark
+                ):
+                    self.max_watermark = watermark
+
+    def get_numbered_path(self, suffix):
+        if not suffix:
+            return self.base_output_file
+        stem = self.base_output_file[: -len(f".{self.landing_format}")]
+        return f"{stem}_{suffix}.{self.landing_format}"
+
+    def reserve_partial_file(self):
+        # Created exclusively, so concurrent runs never share a '.part' file
+        while True:
+            output_file = self.get_numbered_path(self.suffix)
+            partial_file = f"{output_file}.part"
+            if not os.path.exists(output_file):
+                try:
+                    os.close(
+                        os.open(partial_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    )
+                    return output_file, partial_file
+                except FileExistsError:
+                    pass
+            self.suffix += 1
+
+    @property
+    def content_hash(self):
+        return f"{self.hash_sum:032x}-{self.record_count}"
+
+    def close(self):
+        if self.landing_format == "json":
+            self.file.write("\n]}\n")
+        self.file.close()
+        # A hard link fails instead of replacing a file landed in the meantime
+        while True:
+            try:
+                os.link(self.partial_file, self.output_file)
+                break
+            except FileExistsError:
+                self.suffix += 1
+                self.output_file = self.get_numbered_path(self.suffix)
+        os.remove(self.partial_file)
+        return self.output_file
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.partial_file):
+            os.remove(self.partial_file)
+
+
 class c_extract_data:
-    def __init__(self, dataset_config, base_url, headers, output_dir):
+    def __init__(
+        self,
+        dataset_config,
+        base_url,
+        headers,
+        output_dir,
+        page_size=1000,
+        http_client=None,
+        state_store=None,
+        project_columns=True,
+        max_filter_values=50,
+        max_workers=4,
+        landing_format="json",
+        catalog=None,
+    ):
         self.base_url = base_url
         self.headers = headers
         self.dataset_config = dataset_config
         self.output_dir = output_dir
+        self.page_size = page_size
+        self.http_client = http_client or c_http_client(**cfg.EXTRACT_CONFIG["http"])
+        # Incremental extraction is only enabled when a state store is given
+        self.state_store = state_store
+        self.project_columns = project_columns
+        self.max_filter_values = max_filter_values
+        self.max_workers = max_workers
+        self.landing_format = landing_format
+        # Optional c_gho_catalog to resolve indicator names and prune filters
+        self.catalog = catalog
 
     def construct_filter_query(self, filters):
         """
@@ -32,12 +231,62 @@ class c_extract_data:
                 if len(values) > 1:
                     filter_part = f"({filter_part})"
             else:  # For single-value filters like a date
-                filter_part = f"{key} ge '{values}'"
+                filter_part = f"{key} ge {format_odata_literal(values)}"
             filter_clauses.append(filter_part)
 
         return " and ".join(filter_clauses)
 
-    def get_data(self, indicator_key):
+    def construct_select_query(self, indicator_config):
+        """
+        Constructs the OData $select from the dataset's staging_schema, so only the
+        columns the transform and load actually use are sent. Staging columns are
+        mapped back to GHO names through the transform's 'aliases' and
+        GHO_FACT_COLUMNS; columns created downstream (e.g. transformed_epoch) are
+        skipped. Returns None when the dataset has no staging_schema.
+        """
+        schema = indicator_config.get("staging_schema")
+        if not schema:
+            return None
+
+        aliases = indicator_config.get("transform", {}).get("aliases", {})
+        gho_columns = {column.lower(): column for column in cfg.GHO_FACT_COLUMNS}
+
+        selected = []
+        for col_name, _ in schema["columns"]:
+            source_column = aliases.get(col_name) or gho_columns.get(col_name)
+            if source_column and source_column not in selected:
+                selected.append(source_column)
+
+        watermark_field = indicator_config.get("watermark_field")
+        if watermark_field and watermark_field not in selected:
+            selected.append(watermark_field)
+
+        return ",".join(selected)
+
+    def shard_filters(self, filters):
+        """
+        Splits list filters longer than 'max_filter_values' into chunks and returns
+        one filters dict per combination of chunks. Each shard stays well under URL
+        length limits and the shards together cover exactly the original filter.
+        """
+        chunked = []
+        for key, values in filters.items():
+            if isinstance(values, list) and len(values) > self.max_filter_values:
+                chunks = [
+                    values[i : i + self.max_filter_values]
+                    for i in range(0, len(values), self.max_filter_values)
+                ]
+            else:
+                chunks = [values]
+            chunked.append([(key, chunk) for chunk in chunks])
+
+        return [dict(combination) for combination in itertools.product(*chunked)]
+
+    def build_requests(self, indicator_key):
+        """
+        Returns one (url, params) pair per filter shard for the first page of an
+        indicator.
+        """
         # Get indicator configuration based on the
         # key
         indicator_config = self.dataset_config.get(indicator_key)
@@ -47,23 +296,70 @@ class c_extract_data:
                 f"{Fore.RED}Indicator '{indicator_key}' not found in the extraction config.{Fore.RESET}"
             )
 
-        # Construct the base URL
-        indicator_code = indicator_config["code"]
+        # Construct the base URL. Without a code the indicator name is resolved
+        # through the metadata catalog.
+        indicator_code = indicator_config.get("code")
+        if not indicator_code and self.catalog is not None:
+            indicator_code = self.catalog.resolve_indicator_code(
+                indicator_config["name"]
+            )
+        if not indicator_code:
+            raise ValueError(
+                f"{Fore.RED}Indicator '{indicator_key}' has no code configured.{Fore.RESET}"
+            )
         url = f"{self.base_url}{indicator_code}"
 
         # Construct the filter query
-        filters = indicator_config.get("filters", {})
-        filter_query = self.construct_filter_query(filters)
-        params = {"$filter": filter_query}
+        filters = dict(indicator_config.get("filters", {}))
+        if self.catalog is not None:
+            filters, dropped = self.catalog.prune_filters(filters)
+            for key, values in dropped.items():
+                print(
+                    f"{Fore.YELLOW}Ignoring unknown {key} values for {indicator_key}: {', '.join(values)}"
+                )
+            empty_keys = [key for key, values in filters.items() if values == []]
+            if empty_keys:
+                raise ValueError(
+                    f"{Fore.RED}No valid {', '.join(empty_keys)} values left for '{indicator_key}'.{Fore.RESET}"
+                )
+        watermark = self.get_watermark(indicator_key)
+        if watermark is not None:
+            filters.setdefault(indicator_config["watermark_field"], watermark)
 
-        # Fetch the data from the API
-        response = requests.get(url, headers=self.headers, params=params)
+        select_query = None
+        if self.project_columns:
+            select_query = self.construct_select_query(indicator_config)
 
-        if response.status_code != 200:
-            raise Exception(
-                f"{Fore.RED}Failed to fetch data: {response.status_code} - {response.text}{Fore.RESET}"
-            )
+        shard_requests = []
+        for shard in self.shard_filters(filters):
+            filter_query = self.construct_filter_query(shard)
+            params = {"$filter": filter_query, "$top": self.page_size, "$skip": 0}
+            if select_query:
+                params["$select"] = select_query
+            shard_requests.append((url, params))
+
+        return shard_requests
+
+    def get_watermark(self, indicator_key):
+        """
+        Returns the lower bound for the indicator's watermark field: the latest
+        value seen on a previous run, or 'DataFreshnessDays' back from now on the
+        first run. None when incremental extraction does not apply.
+        """
+        indicator_config = self.dataset_config[indicator_key]
+        if self.state_store is None or not indicator_config.get("watermark_field"):
+            return None
+
+        watermark = self.state_store.get(indicator_key).get("watermark")
+        if watermark is not None:
+            return parse_watermark(watermark)
 
+        freshness_days = indicator_config.get("DataFreshnessDays")
+        if freshness_days is not None:
+            return datetime.now(timezone.utc) - timedelta(days=freshness_days)
+        return None
+
+    def open_landing_writer(self, indicator_key):
         # Generate the current date and time for the filename and directory structure
         current_time = datetime.now()
         year_month_day = current_time.strftime("%Y%m%d")
@@ -74,25 +370,214 @@ class c_extract_data:
         if not os.path.exists(indicator_dir):
             os.makedirs(indicator_dir)
 
-        # Store the data to a file named as HHmm.json
-        output_file = os.path.join(indicator_dir, f"{hour_minute}.json")
+        # Store the data to a file named as HHmm.<format>, e.g. 1319.ndjson.gz
+        output_file = os.path.join(
+            indicator_dir, f"{hour_minute}.{self.landing_format}"
+        )
+        watermark_field = self.dataset_config[indicator_key].get("watermark_field")
+        return c_landing_writer(
+            output_file,
+            watermark_field,
+            dedup_field="Id",
+            landing_format=self.landing_format,
+        )
+
+    def close_landing_writer(self, indicator_key, writer, validators=None):
+        """
+        Finalises the landing file, then stores the indicator's watermark, content
+        hash and HTTP validators. State only moves once the data it covers is
+        safely on disk. Returns None, and discards the file, when nothing was
+        returned or the content matches the last landed snapshot. 'validators'
+        maps each shard's request signature to its ETag/Last-Modified.
+        """
+        state_updates = {}
+        if validators is not None:
+            state_updates["validators"] = validators
+        previous_hash = None
+        if self.state_store is not None:
+            previous_hash = self.state_store.get(indicator_key).get("content_hash")
+
+        if writer.record_count == 0 or writer.content_hash == previous_hash:
+            writer.abort()
+            output_file = None
+        else:
+            output_file = writer.close()
+            state_updates["content_hash"] = writer.content_hash
+            if writer.max_watermark is not None:
+                watermark = writer.max_watermark
+                if isinstance(watermark, datetime):
+                    watermark = watermark.isoformat()
+                state_updates["watermark"] = watermark
+
+        if self.state_store is not None and state_updates:
+            self.state_store.update(indicator_key, **state_updates)
 
-        with open(output_file, "w") as f:
-            json.dump(response.json(), f, indent=4)
+        return output_file
+
+    def get_data(self, indicator_key):
+        shard_requests = self.build_requests(indicator_key)
+        validators = {}
+        writer_lock = threading.Lock()
+
+        writer = self.open_landing_writer(indicator_key)
+
+        def fetch_shard(url, params):
+            payload, shard_validators = self.fetch_first_page(
+                indicator_key, url, params
+            )
+            if payload is not None:
+                page_count = 0
+                for page in self.iter_pages(url, params, payload):
+                    page_count += bool(page)
+                    with writer_lock:
+                        writer.write_page(page)
+                self.set_single_page(shard_validators, page_count <= 1)
+            with writer_lock:
+                validators.update(shard_validators)
+
+        try:
+            # Shards are independent queries, so they are fetched in parallel
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(shard_requests))
+            ) as executor:
+                list(
+                    executor.map(lambda request: fetch_shard(*request), shard_requests)
+                )
+            output_file = self.close_landing_writer(indicator_key, writer, validators)
+        except Exception:
+            writer.abort()
+            raise
+
+        if output_file is None:
+            print(f"{Fore.CYAN}No new or changed data for {indicator_key}. Skipping.")
+            return None
 
         print(
-            f"{Fore.GREEN}Data for {indicator_key} saved to {output_file}{Fore.RESET}"
+            f"{Fore.GREEN}Data for {indicator_key} saved to {output_file} ({writer.record_count} records){Fore.RESET}"
         )
+        return output_file
+
+    def check_response(self, response):
+        if response.status_code != 200:
+            raise Exception(
+                f"{Fore.RED}Failed to fetch data: {response.status_code} - {response.text}{Fore.RESET}"
+            )
+
+    def fetch_page(self, url, params):
+        """
+        Fetches a single OData page and returns the decoded payload.
+        """
+        response = self.http_client.get(url, params=params, headers=self.headers)
+        self.check_response(response)
+        return response.json()
+
+    def get_request_signature(self, url, params):
+        request = json.dumps([url, params], sort_keys=True, default=str)
+        return hashlib.sha1(request.encode("utf-8")).hexdigest()
+
+    def fetch_first_page(self, indicator_key, url, params):
+        """
+        Fetches the first page as a conditional request, using the ETag and
+        Last-Modified stored for the same query on the last run. Returns the
+        payload (None on 304 Not Modified) and a {signature: validators} dict to
+        store once the data is landed. The validators only cover the first page,
+        so the request is only conditional when the last result fit on it.
+        """
+        signature = self.get_request_signature(url, params)
+        headers = dict(self.headers)
+
+        previous = {}
+        if self.state_store is not None:
+            state = self.state_store.get(indicator_key)
+            previous = state.get("validators", {}).get(signature, {})
+        if previous.get("single_page"):
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        response = self.http_client.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, {signature: previous}
+        self.check_response(response)
+
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return response.json(), {signature: validators}
+
+    def set_single_page(self, shard_validators, single_page):
+        # Set once the whole shard is fetched; see fetch_first_page
+        for validators in shard_validators.values():
+            validators["single_page"] = single_page
+
+    def iter_pages(self, url, params, payload=None):
+        """
+        Yields the 'value' list of each OData page in turn. Follows '@odata.nextLink'
+        when the server provides one, otherwise pages with '$top'/'$skip' until an
+        empty page is returned. '$skip' steps by the rows actually returned, since
+        the server may cap '$top'. Only one page is held in memory at a time. An
+        already fetched first page can be passed in as 'payload'.
+        """
+        params = dict(params)
+        next_url = url
+
+        while next_url:
+            if payload is None:
+                payload = self.fetch_page(next_url, params)
+            page = payload.get("value", [])
+            yield page
+
+            next_link = payload.get("@odata.nextLink")
+            payload = None
+            if next_link:
+                # The next link already carries the full query string
+                next_url, params = next_link, None
+            elif params is not None and page:
+                params = dict(params, **{"$skip": params["$skip"] + len(page)})
+            else:
+                next_url = None
+
+
+def create_http_client():
+    return c_http_client(
+        **cfg.EXTRACT_CONFIG["http"], rate_limiter=create_rate_limiter()
+    )
+
+
+def create_catalog(http_client=None):
+    return c_gho_catalog(
+        cfg.BASE_API_URL,
+        http_client=http_client,
+        cache_file=cfg.CATALOG_CONFIG["cache_file"],
+        ttl_hours=cfg.CATALOG_CONFIG["ttl_hours"],
+        memory_cache_size=cfg.CATALOG_CONFIG["memory_cache_size"],
+        filter_dimensions=cfg.CATALOG_CONFIG["filter_dimensions"],
+    )
 
 
 # Main block to run the extractor if executed as a
 # script
 if __name__ == "__main__":
+    http_client = create_http_client()
     extractor = c_extract_data(
         dataset_config=cfg.DATASET_CONFIG,
         base_url=cfg.BASE_API_URL,
         headers=cfg.HEADERS,
         output_dir=cfg.LANDING_DATA_DIR,
+        page_size=cfg.EXTRACT_CONFIG["page_size"],
+        http_client=http_client,
+        state_store=c_state_store(),
+        project_columns=cfg.EXTRACT_CONFIG["project_columns"],
+        max_filter_values=cfg.EXTRACT_CONFIG["max_filter_values"],
+        max_workers=cfg.EXTRACT_CONFIG["max_concurrency_per_host"],
+        landing_format=cfg.EXTRACT_CONFIG["landing_format"],
+        catalog=(
+            create_catalog(http_client)
+            if cfg.EXTRACT_CONFIG["validate_filters"]
+            else None
+        ),
     )
 
     # Example: Get data for
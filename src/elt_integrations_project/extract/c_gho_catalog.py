@@ -0,0 +1,178 @@
+import sys
+import os
+import time
+from collections import OrderedDict
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.common.c_file_lock import (  # noqa: E402
+    c_file_lock,
+    read_json_file,
+    write_json_file_atomic,
+)
+from src.elt_integrations_project.extract.c_http_client import (  # noqa: E402
+    c_http_client,
+)
+
+# Initialize colorama
+init(autoreset=True)
+
+
+class c_gho_catalog:
+    """
+    GHO metadata (the Indicator list and dimension values) cached on disk with a
+    TTL and in memory with a small LRU. Used to resolve indicator names to codes
+    and to drop filter values the API does not know, without fetching the
+    metadata again on every run.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        http_client=None,
+        cache_file=None,
+        ttl_hours=24,
+        memory_cache_size=32,
+        filter_dimensions=None,
+    ):
+        self.base_url = base_url
+        self.http_client = http_client or c_http_client(**cfg.EXTRACT_CONFIG["http"])
+        self.cache_file = cache_file or cfg.CATALOG_CONFIG["cache_file"]
+        self.ttl_seconds = ttl_hours * 3600
+        self.memory_cache_size = memory_cache_size
+        self.memory_cache = OrderedDict()
+        # Filter key -> GHO dimensions whose codes are valid values for it
+        self.filter_dimensions = filter_dimensions or {}
+
+    def get_from_memory(self, key):
+        entry = self.memory_cache.get(key)
+        if entry is None or time.time() - entry["fetched_at"] > self.ttl_seconds:
+            return None
+        self.memory_cache.move_to_end(key)
+        return entry["values"]
+
+    def put_in_memory(self, key, entry):
+        self.memory_cache[key] = entry
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.memory_cache_size:
+            self.memory_cache.popitem(last=False)
+
+    def get_entry(self, key, path):
+        """
+        Returns the cached list for 'key', fetching '<base_url><path>' when the
+        memory and disk copies are missing or older than the TTL. A stale disk
+        copy is still used if the API cannot be reached. None if nothing is known.
+        """
+        values = self.get_from_memory(key)
+        if values is not None:
+            return values
+
+        entry = read_json_file(self.cache_file, default={}).get(key)
+        if entry and time.time() - entry["fetched_at"] <= self.ttl_seconds:
+            self.put_in_memory(key, entry)
+            return entry["values"]
+
+        try:
+            response = self.http_client.get(f"{self.base_url}{path}")
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
+            fresh_entry = {
+                "fetched_at": time.time(),
+                "values": response.json().get("value", []),
+            }
+        except Exception as e:
+            print(f"{Fore.YELLOW}Could not refresh GHO metadata '{key}': {str(e)}")
+            if entry:
+                self.put_in_memory(key, entry)
+                return entry["values"]
+            return None
+
+        with c_file_lock(self.cache_file):
+            cache = read_json_file(self.cache_file, default={})
+            cache[key] = fresh_entry
+            write_json_file_atomic(self.cache_file, cache)
+
+        self.put_in_memory(key, fresh_entry)
+        return fresh_entry["values"]
+
+    def get_indicators(self):
+        return self.get_entry("indicators", "Indicator")
+
+    def get_dimension_values(self, dimension_code):
+        return self.get_entry(
+            f"dimension:{dimension_code}", f"DIMENSION/{dimension_code}/DimensionValues"
+        )
+
+    def resolve_indicator_code(self, name_or_code):
+        """
+        Returns the IndicatorCode for a code or an exact (case-insensitive)
+        IndicatorName. Raises ValueError when the catalog has no match.
+        """
+        indicators = self.get_indicators()
+        if indicators is None:
+            raise ValueError(
+                f"{Fore.RED}GHO indicator catalog unavailable; cannot resolve '{name_or_code}'.{Fore.RESET}"
+            )
+
+        for indicator in indicators:
+            if indicator.get("IndicatorCode") == name_or_code:
+                return name_or_code
+
+        wanted_name = name_or_code.strip().lower()
+        for indicator in indicators:
+            if (indicator.get("IndicatorName") or "").strip().lower() == wanted_name:
+                return indicator["IndicatorCode"]
+
+        raise ValueError(
+            f"{Fore.RED}Indicator '{name_or_code}' not found in the GHO catalog.{Fore.RESET}"
+        )
+
+    def get_valid_values(self, filter_key):
+        dimensions = self.filter_dimensions.get(filter_key)
+        if not dimensions:
+            return None
+
+        valid_values = set()
+        for dimension_code in dimensions:
+            values = self.get_dimension_values(dimension_code)
+            if values is None:
+                return None
+            valid_values.update(value["Code"] for value in values)
+        return valid_values
+
+    def prune_filters(self, filters):
+        """
+        Returns (filters, dropped): list filters with values unknown to GHO
+        removed, and the dropped values per key. Keys without a known dimension,
+        or whose metadata is unavailable, are left untouched.
+        """
+        pruned, dropped = {}, {}
+        for key, values in filters.items():
+            valid_values = None
+            if isinstance(values, list):
+                valid_values = self.get_valid_values(key)
+
+            if valid_values is None:
+                pruned[key] = values
+                continue
+
+            pruned[key] = [value for value in values if value in valid_values]
+            invalid = [value for value in values if value not in valid_values]
+            if invalid:
+                dropped[key] = invalid
+
+        return pruned, dropped
+
+
+if __name__ == "__main__":
+    catalog = c_gho_catalog(
+        cfg.BASE_API_URL,
+        ttl_hours=cfg.CATALOG_CONFIG["ttl_hours"],
+        memory_cache_size=cfg.CATALOG_CONFIG["memory_cache_size"],
+        filter_dimensions=cfg.CATALOG_CONFIG["filter_dimensions"],
+    )
+    for dataset_name, dataset in cfg.DATASET_CONFIG.items():
+        code = catalog.resolve_indicator_code(dataset.get("code") or dataset["name"])
+        _, dropped = catalog.prune_filters(dataset.get("filters", {}))
+        print(f"{dataset_name}: {code} (invalid filter values: {dropped or 'none'})")
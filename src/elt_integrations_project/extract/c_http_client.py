@@ -0,0 +1,107 @@
+import sys
+import os
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+
+# Initialize colorama
+init(autoreset=True)
+
+
+class c_http_client:
+    """
+    Shared HTTP client for the GHO API. One pooled keep-alive session is reused for
+    every request, responses are negotiated as gzip/deflate, and transient failures
+    (connection errors, timeouts, 429 and 5xx) are retried with exponential backoff
+    and full jitter. With a rate limiter, every attempt first takes a token from the
+    shared bucket, and a 429 pauses the bucket for all processes.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize=10,
+        timeout_seconds=30,
+        max_retries=5,
+        backoff_base_seconds=0.5,
+        backoff_max_seconds=30,
+        retry_statuses=(429, 500, 502, 503, 504),
+        rate_limiter=None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.retry_statuses = set(retry_statuses)
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        # Retries are handled below so backoff and jitter stay under our control
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+
+    def get_backoff_seconds(self, attempt, response=None):
+        # Honour the server's Retry-After (in seconds) when it sends one
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max_seconds)
+
+        backoff = min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+        return random.uniform(0, backoff)
+
+    def get(self, url, params=None, headers=None):
+        """
+        Performs a GET and returns the final response. Responses with a
+        non-retryable status are returned as-is for the caller to handle.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout_seconds
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                wait_seconds = self.get_backoff_seconds(attempt)
+                print(
+                    f"{Fore.YELLOW}Request to {url} failed ({e.__class__.__name__}). Retrying in {wait_seconds:.1f}s"
+                )
+            else:
+                if (
+                    response.status_code not in self.retry_statuses
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                wait_seconds = self.get_backoff_seconds(attempt, response)
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(wait_seconds)
+                print(
+                    f"{Fore.YELLOW}Request to {url} returned {response.status_code}. Retrying in {wait_seconds:.1f}s"
+                )
+                response.close()
+
+            time.sleep(wait_seconds)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+
+if __name__ == "__main__":
+    client = c_http_client(**cfg.EXTRACT_CONFIG["http"])
+    response = client.get(cfg.BASE_API_URL)
+    print(f"{response.status_code} {response.headers.get('Content-Encoding')}")
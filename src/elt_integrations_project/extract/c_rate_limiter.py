@@ -0,0 +1,88 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.common.c_file_lock import (  # noqa: E402
+    c_file_lock,
+    read_json_file,
+    write_json_file_atomic,
+)
+
+
+class c_rate_limiter:
+    """
+    Token bucket shared by every extractor process, thread and coroutine on the
+    host. The bucket lives in a small JSON state file guarded by a file lock, so
+    parallel extract tasks launched by the scheduler draw from one budget.
+    """
+
+    def __init__(self, state_file=None, requests_per_second=10, burst=20):
+        self.state_file = state_file or cfg.RATE_LIMIT_STATE_FILE
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+
+    def read_bucket(self, now):
+        bucket = read_json_file(
+            self.state_file,
+            default={"tokens": self.burst, "updated_at": now, "paused_until": 0},
+        )
+        elapsed = max(0.0, now - bucket["updated_at"])
+        bucket["tokens"] = min(
+            self.burst, bucket["tokens"] + elapsed * self.requests_per_second
+        )
+        bucket["updated_at"] = now
+        return bucket
+
+    def try_acquire(self):
+        """
+        Takes one token if available. Returns 0 on success, otherwise the number of
+        seconds to wait before trying again.
+        """
+        with c_file_lock(self.state_file):
+            now = time.time()
+            bucket = self.read_bucket(now)
+
+            if bucket.get("paused_until", 0) > now:
+                wait_seconds = bucket["paused_until"] - now
+            elif bucket["tokens"] >= 1:
+                bucket["tokens"] -= 1
+                wait_seconds = 0
+            else:
+                wait_seconds = (1 - bucket["tokens"]) / self.requests_per_second
+
+            write_json_file_atomic(self.state_file, bucket)
+            return wait_seconds
+
+    def acquire(self):
+        # Sleep outside the lock so other processes can keep refilling/taking
+        while True:
+            wait_seconds = self.try_acquire()
+            if wait_seconds <= 0:
+                return
+            time.sleep(wait_seconds)
+
+    def pause(self, seconds):
+        """
+        Stops every process from sending for 'seconds', e.g. after a 429.
+        """
+        with c_file_lock(self.state_file):
+            now = time.time()
+            bucket = self.read_bucket(now)
+            bucket["paused_until"] = max(bucket.get("paused_until", 0), now + seconds)
+            bucket["tokens"] = 0
+            write_json_file_atomic(self.state_file, bucket)
+
+
+def create_rate_limiter():
+    """
+    Returns the host-wide limiter from EXTRACT_CONFIG, or None when disabled.
+    """
+    rate_limit = cfg.EXTRACT_CONFIG["rate_limit"]
+    if not rate_limit["enabled"]:
+        return None
+    return c_rate_limiter(
+        requests_per_second=rate_limit["requests_per_second"],
+        burst=rate_limit["burst"],
+    )
@@ -0,0 +1,32 @@
+import sys
+import os
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.common.c_file_lock import (  # noqa: E402
+    c_file_lock,
+    read_json_file,
+    write_json_file_atomic,
+)
+
+
+class c_state_store:
+    """
+    Persistent per-indicator extract state (e.g. the watermark of the last run),
+    kept as one JSON document. Updates are locked so parallel extract processes
+    do not overwrite each other's indicators.
+    """
+
+    def __init__(self, state_file=None):
+        self.state_file = state_file or cfg.EXTRACT_STATE_FILE
+
+    def get(self, indicator_key):
+        state = read_json_file(self.state_file, default={})
+        return state.get(indicator_key, {})
+
+    def update(self, indicator_key, **fields):
+        with c_file_lock(self.state_file):
+            state = read_json_file(self.state_file, default={})
+            state.setdefault(indicator_key, {}).update(fields)
+            write_json_file_atomic(self.state_file, state)
+        return state[indicator_key]
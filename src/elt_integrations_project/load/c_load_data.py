@@ -1,7 +1,9 @@
 from config import config as cfg
+import io
 import json
 import os
 import sys
+import polars as pl
 import psycopg2
 from psycopg2 import OperationalError
 from colorama import Fore, Style, init
@@ -23,6 +25,10 @@ class c_load_data:
         self.staging_dir = cfg.STAGING_DATA_DIR
         self.log_dir = cfg.LOG_DIR
         self.dataset_config = cfg.DATASET_CONFIG
+        self.load_method = cfg.LOAD_CONFIG["method"]
+        self.copy_batch_rows = cfg.LOAD_CONFIG["copy_batch_rows"]
+        # Columns that change on every run and do not make a row "changed"
+        self.compare_exclude_columns = set(cfg.LOAD_CONFIG["compare_exclude_columns"])
 
     def process_all_files(self):
         for dataset_name in self.dataset_config:
@@ -35,25 +41,25 @@ class c_load_data:
 
             for root, _, files in os.walk(staging_path):
                 for file in files:
-                    if file.endswith(".json"):
+                    if file.endswith(tuple(cfg.STAGING_FILE_EXTENSIONS.values())):
                         file_path = os.path.join(root, file)
                         self.process_single_file(dataset_name, file_path)
 
     def process_single_file(self, dataset_name, file_path):
         try:
             # Load and insert data
-            with open(file_path, "r") as file:
-                json_data = json.load(file)
+            data = self.read_staging_file(file_path)
 
-            stats = self.insert_json_data_to_psql(json.dumps(json_data), dataset_name)
+            if self.load_method == "copy":
+                stats = self.copy_data_to_psql(data, dataset_name)
+            else:
+                stats = self.insert_data_to_psql(data, dataset_name)
 
             # Create log file
             self.create_log_file(dataset_name, file_path, success=True, stats=stats)
 
             # Delete original file if all data was processed
-            if stats["skipped"] + stats["inserted"] + stats["updated"] == len(
-                json_data
-            ):
+            if stats["skipped"] + stats["inserted"] + stats["updated"] == data.height:
                 os.remove(file_path)
                 print(f"{Fore.GREEN}Successfully processed and deleted: {file_path}")
             else:
@@ -66,28 +72,171 @@ class c_load_data:
             self.create_log_file(dataset_name, file_path, success=False, error=str(e))
             raise  # Re-raise the exception
 
+    def read_staging_file(self, file_path):
+        """
+        Reads a staging file into a DataFrame. Parquet and Arrow IPC are read
+        natively with their dtypes; legacy JSON row lists are still accepted.
+        """
+        if file_path.endswith(".parquet"):
+            return pl.read_parquet(file_path)
+        if file_path.endswith(".arrow"):
+            return pl.read_ipc(file_path)
+
+        with open(file_path, "r") as file:
+            json_data = json.load(file)
+        if not isinstance(json_data, list):
+            json_data = [json_data]
+        return pl.DataFrame(json_data, infer_schema_length=None)
+
     def insert_json_data_to_psql(self, json_data, dataset_name):
+        try:
+            data_list = json.loads(json_data)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error processing data for {dataset_name}: {str(e)}")
+            raise
+        if not isinstance(data_list, list):
+            data_list = [data_list]
+        return self.insert_data_to_psql(
+            pl.DataFrame(data_list, infer_schema_length=None), dataset_name
+        )
+
+    def write_csv_buffer(self, data):
+        # NULLs are written unquoted and empty strings quoted, matching COPY CSV
+        buffer = io.BytesIO()
+        data.write_csv(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def get_conflict_columns(self, dataset_name, columns):
+        # The staging_schema natural key (backed by a unique index) when the file
+        # has all of its columns; 'id' otherwise
+        schema = self.dataset_config[dataset_name].get("staging_schema", {})
+        natural_key = schema.get("natural_key") or []
+        if natural_key and all(col in columns for col in natural_key):
+            return list(natural_key)
+        return ["id"]
+
+    def build_merge_sql(
+        self, dataset_name, columns, staging_table, conflict_columns=("id",)
+    ):
+        """
+        One set-based upsert from the temp table into the target, keyed on
+        'conflict_columns'. Unchanged rows are left alone: by their stored
+        row_hash when the table has one, otherwise by comparing the columns.
+        RETURNING (xmax = 0) tells fresh inserts apart from updates.
+        """
+        column_list = ", ".join(columns)
+        # The surrogate id is kept from the first insert
+        update_columns = [
+            col for col in columns if col != "id" and col not in conflict_columns
+        ]
+        excluded_list = ", ".join(f"EXCLUDED.{col}" for col in update_columns)
+        if "row_hash" in columns:
+            changed_condition = (
+                f"{dataset_name}.row_hash IS DISTINCT FROM EXCLUDED.row_hash"
+            )
+        else:
+            compare_columns = [
+                col for col in update_columns if col not in self.compare_exclude_columns
+            ]
+            current_compare = ", ".join(
+                f"{dataset_name}.{col}" for col in compare_columns
+            )
+            excluded_compare = ", ".join(f"EXCLUDED.{col}" for col in compare_columns)
+            changed_condition = (
+                f"ROW({current_compare}) IS DISTINCT FROM ROW({excluded_compare})"
+            )
+
+        return (
+            f"WITH merged AS ("
+            f"INSERT INTO {dataset_name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging_table} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE "
+            f"SET ({', '.join(update_columns)}) = ROW({excluded_list}) "
+            f"WHERE {changed_condition} "
+            f"RETURNING (xmax = 0) AS inserted) "
+            f"SELECT count(*) FILTER (WHERE inserted), "
+            f"count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+
+    def copy_data_to_psql(self, data, dataset_name):
+        """
+        Bulk path: each batch of 'copy_batch_rows' rows is streamed with COPY ...
+        FROM STDIN into a session temp table and merged into the target with a
+        single INSERT ... ON CONFLICT DO UPDATE on the dataset's natural key.
+        Safe with concurrent loaders; one transaction per file. 'skipped' counts
+        rows that were unchanged.
+        """
         conn = None
         stats = {"skipped": 0, "inserted": 0, "updated": 0}
+        staging_table = f"load_{dataset_name}"
         try:
-            data_list = json.loads(json_data)
-            if not isinstance(data_list, list):
-                data_list = [data_list]
+            # A row may only be merged once per statement; the newest copy wins
+            conflict_columns = self.get_conflict_columns(dataset_name, data.columns)
+            row_count = data.height
+            data = data.unique(
+                subset=conflict_columns, keep="last", maintain_order=True
+            )
+            stats["skipped"] += row_count - data.height
+
+            conn = psycopg2.connect(**self.db_params)
+            cursor = conn.cursor()
 
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging_table} "
+                f"(LIKE {dataset_name}) ON COMMIT DROP"
+            )
+            copy_sql = (
+                f"COPY {staging_table} ({', '.join(data.columns)}) "
+                "FROM STDIN WITH (FORMAT csv, HEADER true)"
+            )
+            merge_sql = self.build_merge_sql(
+                dataset_name, data.columns, staging_table, conflict_columns
+            )
+
+            for batch in data.iter_slices(self.copy_batch_rows):
+                cursor.copy_expert(copy_sql, self.write_csv_buffer(batch))
+                cursor.execute(merge_sql)
+                inserted, updated = cursor.fetchone()
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                stats["skipped"] += batch.height - inserted - updated
+                cursor.execute(f"TRUNCATE {staging_table}")
+
+            conn.commit()
+            logger.info(f"Data processing completed for {dataset_name}.")
+            return stats
+
+        except (psycopg2.Error, Exception) as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Error processing data for {dataset_name}: {str(e)}")
+            raise
+        finally:
+            if conn:
+                cursor.close()
+                conn.close()
+
+    def insert_data_to_psql(self, data, dataset_name):
+        conn = None
+        stats = {"skipped": 0, "inserted": 0, "updated": 0}
+        try:
             conn = psycopg2.connect(**self.db_params)
             cursor = conn.cursor()
 
-            for data in data_list:
-                columns = ", ".join(data.keys())
-                values = ", ".join(["%s"] * len(data))
+            columns = ", ".join(data.columns)
+            values = ", ".join(["%s"] * len(data.columns))
+            id_index = data.columns.index("id")
 
+            # Rows come out of the frame as tuples, already in column order
+            for row in data.iter_rows():
                 # Check if the data already exists
                 check_sql = f"SELECT COUNT(*) FROM {dataset_name} WHERE id = %s"
-                cursor.execute(check_sql, (data["id"],))
+                cursor.execute(check_sql, (row[id_index],))
                 if cursor.fetchone()[0] > 0:
                     # Data exists, update if necessary
                     update_sql = f"UPDATE {dataset_name} SET ({columns}) = ({values}) WHERE id = %s"
-                    cursor.execute(update_sql, tuple(data.values()) + (data["id"],))
+                    cursor.execute(update_sql, row + (row[id_index],))
                     if cursor.rowcount > 0:
                         stats["updated"] += 1
                     else:
@@ -97,14 +246,14 @@ class c_load_data:
                     insert_sql = (
                         f"INSERT INTO {dataset_name} ({columns}) VALUES ({values})"
                     )
-                    cursor.execute(insert_sql, tuple(data.values()))
+                    cursor.execute(insert_sql, row)
                     stats["inserted"] += 1
 
             conn.commit()
             logger.info(f"Data processing completed for {dataset_name}.")
             return stats
 
-        except (json.JSONDecodeError, psycopg2.Error, Exception) as e:
+        except (psycopg2.Error, Exception) as e:
             logger.error(f"Error processing data for {dataset_name}: {str(e)}")
             raise
         finally:
@@ -0,0 +1,116 @@
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class c_json_stream_reader:
+    """
+    Incremental reader for the records of one top-level array in a JSON document,
+    e.g. the 'value' list of a GHO OData response. The file is read in fixed-size
+    chunks and each record is decoded as soon as it is complete, so memory use
+    depends on the chunk and batch size, not on the size of the file.
+    """
+
+    def __init__(self, file_path, array_key="value", chunk_size=1 << 20):
+        self.file_path = file_path
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self.file = None
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        # Drop what has been consumed, then append the next chunk
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        # A text read only returns fewer characters than asked for at the end
+        if len(chunk) < self.chunk_size:
+            self.eof = True
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return
+            self.fill()
+
+    def peek(self):
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError(f"Unexpected end of JSON in {self.file_path}")
+        return self.buffer[self.pos]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(
+                f"Expected '{char}' at offset {self.pos} in {self.file_path}, found '{self.buffer[self.pos]}'"
+            )
+        self.pos += 1
+
+    def decode_value(self):
+        """
+        Decodes the next JSON value. A value that ends exactly at the end of the
+        buffer may be truncated (e.g. a number), so more input is read first.
+        """
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def iter_records(self):
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            self.file = file
+            self.buffer, self.pos, self.eof = "", 0, False
+            self.fill()
+
+            self.expect("{")
+            if self.peek() == "}":
+                return
+            while True:
+                key = self.decode_value()
+                self.expect(":")
+                if key == self.array_key:
+                    yield from self.iter_array()
+                else:
+                    # Other members (e.g. '@odata.context') are small; skip them
+                    self.decode_value()
+
+                if self.peek() == ",":
+                    self.pos += 1
+                    continue
+                self.expect("}")
+                return
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def iter_batches(self, batch_size=10000):
+        batch = []
+        for record in self.iter_records():
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
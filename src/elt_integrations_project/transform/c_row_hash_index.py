@@ -0,0 +1,93 @@
+import sys
+import os
+import polars as pl
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.common.c_file_lock import (  # noqa: E402
+    c_file_lock,
+)
+
+
+class c_row_hash_index:
+    """
+    Persisted (key, row_hash) pairs from the last staged snapshot of a dataset.
+    Rows whose hash matches the index are unchanged since they were last staged
+    and can be skipped; only new or changed rows are forwarded to staging.
+    """
+
+    def __init__(
+        self, index_file, key_column="id", exclude_columns=None, column_dtypes=None
+    ):
+        self.index_file = index_file
+        self.key_column = key_column
+        # Hashed columns are cast to these dtypes (String when not listed) first
+        self.column_dtypes = column_dtypes or {}
+        # Columns that change on every run (e.g. transformed_epoch) are not hashed
+        self.exclude_columns = set(
+            exclude_columns or cfg.TRANSFORM_CONFIG["hash_exclude_columns"]
+        )
+
+    def read_index(self):
+        if not os.path.exists(self.index_file):
+            return pl.DataFrame(
+                schema={self.key_column: pl.Int64, "row_hash": pl.UInt64}
+            )
+        return pl.read_parquet(self.index_file)
+
+    def add_row_hashes(self, data):
+        # Sorted so the hash does not depend on the column order of the input
+        hashed_columns = sorted(
+            col for col in data.columns if col not in self.exclude_columns
+        )
+        # The hash has to depend on the values only: polars infers an all-null
+        # column as Null in one file and as String in the next
+        hashed_values = [
+            pl.col(col).cast(self.column_dtypes.get(col, pl.String), strict=False)
+            for col in hashed_columns
+        ]
+        return data.with_columns(
+            pl.struct(hashed_values).hash(seed=0).alias("row_hash")
+        )
+
+    def filter_changed(self, data, keep_hash=False):
+        """
+        Returns (changed_data, changed_hashes): the rows of 'data' that are new or
+        differ from the index (with their 'row_hash' column if 'keep_hash'), and
+        their (key, row_hash) pairs to commit once the rows are safely staged.
+        """
+        hashed = self.add_row_hashes(data)
+        index = self.read_index().with_columns(
+            pl.col(self.key_column).cast(hashed.schema[self.key_column])
+        )
+        changed = hashed.join(index, on=[self.key_column, "row_hash"], how="anti")
+        return (
+            changed if keep_hash else changed.drop("row_hash"),
+            changed.select(self.key_column, "row_hash"),
+        )
+
+    def lock(self):
+        """
+        Held from filter_changed until the changed rows are staged and committed,
+        so concurrent runs cannot both stage the same delta.
+        """
+        return c_file_lock(self.index_file)
+
+    def commit(self, changed_hashes):
+        # Callers hold lock(); taking it again here would block on itself
+        if changed_hashes is None or changed_hashes.is_empty():
+            return
+
+        index = self.read_index().with_columns(
+            pl.col(self.key_column).cast(changed_hashes.schema[self.key_column])
+        )
+        index = pl.concat(
+            [
+                index.join(changed_hashes, on=self.key_column, how="anti"),
+                changed_hashes,
+            ]
+        )
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        temp_path = f"{self.index_file}.tmp.{os.getpid()}"
+        index.write_parquet(temp_path)
+        os.replace(temp_path, self.index_file)
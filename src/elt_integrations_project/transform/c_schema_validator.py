@@ -0,0 +1,179 @@
+import re
+import polars as pl
+
+# Set by the transform for rows whose values could not be converted
+TRANSFORM_ERROR_COLUMN = "transform_error"
+
+# PostgreSQL base type -> polars dtype its values must convert to
+SQL_TYPE_DTYPES = {
+    "SMALLINT": pl.Int16,
+    "INTEGER": pl.Int32,
+    "INT": pl.Int32,
+    "SERIAL": pl.Int32,
+    "BIGINT": pl.Int64,
+    "BIGSERIAL": pl.Int64,
+    "FLOAT": pl.Float64,
+    "REAL": pl.Float64,
+    "DOUBLE PRECISION": pl.Float64,
+    "NUMERIC": pl.Float64,
+    "BOOLEAN": pl.Boolean,
+    "DATE": pl.Date,
+    "TIMESTAMP": pl.Datetime("us"),
+    "VARCHAR": pl.String,
+    "CHAR": pl.String,
+    "TEXT": pl.String,
+}
+
+
+def parse_column_type(sql_type):
+    """
+    Splits a staging_schema column type such as 'VARCHAR(3)' or 'SERIAL PRIMARY KEY'
+    into {"base_type", "dtype", "max_length", "required"}. Unknown types are not
+    type-checked.
+    """
+    sql_type = sql_type.upper().strip()
+    # Longest names first, so 'DOUBLE PRECISION' wins over shorter prefixes
+    base_type = next(
+        (
+            name
+            for name in sorted(SQL_TYPE_DTYPES, key=len, reverse=True)
+            if re.match(rf"{name}\b", sql_type)
+        ),
+        None,
+    )
+    dtype = SQL_TYPE_DTYPES.get(base_type)
+    length_match = re.match(r"(?:VARCHAR|CHAR)\s*\((\d+)\)", sql_type)
+    max_length = int(length_match.group(1)) if length_match else None
+    return {
+        "base_type": base_type,
+        "dtype": dtype,
+        "max_length": max_length,
+        "required": "PRIMARY KEY" in sql_type or "NOT NULL" in sql_type,
+    }
+
+
+class c_schema_validator:
+    """
+    Checks a DataFrame against a dataset's staging_schema with vectorized polars
+    expressions: required (NOT NULL / PRIMARY KEY) columns, values that cannot be
+    converted to the column's type, and VARCHAR(n) lengths. Rows failing any
+    check are split off with a 'quarantine_reason' instead of failing the load.
+    """
+
+    def __init__(self, staging_schema):
+        self.columns = {
+            col_name: parse_column_type(sql_type)
+            for col_name, sql_type in staging_schema["columns"]
+        }
+        # The loader upserts on the natural key, so its columns must be set
+        for col_name in staging_schema.get("natural_key", []):
+            if col_name in self.columns:
+                self.columns[col_name]["required"] = True
+
+    def get_checks(self, schema):
+        """
+        Returns (reason, failed_expr) pairs for the columns present in 'schema'.
+        """
+        checks = []
+        for col_name, rules in self.columns.items():
+            if col_name not in schema:
+                if rules["required"]:
+                    checks.append((f"{col_name}: missing", pl.lit(True)))
+                continue
+
+            column = pl.col(col_name)
+            if rules["required"]:
+                checks.append((f"{col_name}: null", column.is_null()))
+
+            dtype = rules["dtype"]
+            if dtype is not None and dtype != pl.String and schema[col_name] != dtype:
+                if schema[col_name] == pl.String and dtype in (
+                    pl.Date,
+                    pl.Datetime("us"),
+                ):
+                    converted = (
+                        column.str.to_date(strict=False)
+                        if dtype == pl.Date
+                        else column.str.to_datetime(time_unit="us", strict=False)
+                    )
+                else:
+                    converted = column.cast(dtype, strict=False)
+                checks.append(
+                    (
+                        f"{col_name}: not {rules['base_type']}",
+                        column.is_not_null() & converted.is_null(),
+                    )
+                )
+
+            if rules["max_length"] is not None:
+                checks.append(
+                    (
+                        f"{col_name}: longer than {rules['max_length']}",
+                        column.cast(pl.String).str.len_chars() > rules["max_length"],
+                    )
+                )
+        return checks
+
+    def split(self, data):
+        """
+        Returns (valid, quarantined). Quarantined rows keep their columns plus a
+        'quarantine_reason' listing every failed check, including conversions the
+        transform reported in TRANSFORM_ERROR_COLUMN.
+        """
+        reasons, failures = [], []
+        if TRANSFORM_ERROR_COLUMN in data.columns:
+            reasons.append(pl.col(TRANSFORM_ERROR_COLUMN))
+            failures.append(pl.col(TRANSFORM_ERROR_COLUMN).is_not_null())
+            data_schema = data.drop(TRANSFORM_ERROR_COLUMN).schema
+        else:
+            data_schema = data.schema
+
+        for name, failed in self.get_checks(data_schema):
+            reasons.append(pl.when(failed).then(pl.lit(name)))
+            failures.append(failed)
+
+        if not failures:
+            return data, data.clear().with_columns(
+                pl.lit(None, dtype=pl.String).alias("quarantine_reason")
+            )
+
+        reason = pl.concat_str(reasons, separator="; ", ignore_nulls=True)
+        flagged = data.with_columns(
+            pl.when(pl.any_horizontal(failures)).then(reason).alias("quarantine_reason")
+        )
+        if TRANSFORM_ERROR_COLUMN in data.columns:
+            flagged = flagged.drop(TRANSFORM_ERROR_COLUMN)
+        valid = flagged.filter(pl.col("quarantine_reason").is_null()).drop(
+            "quarantine_reason"
+        )
+        quarantined = flagged.filter(pl.col("quarantine_reason").is_not_null())
+        return valid, quarantined
+
+    def optimize_dtypes(self, data, categorical_max_ratio=0.5):
+        """
+        Casts validated columns to the narrowest dtype their staging_schema type
+        allows (e.g. INTEGER -> Int32) and dictionary-encodes string columns with
+        few distinct values relative to the row count as pl.Categorical.
+        """
+        casts = []
+        string_columns = []
+        for col_name, rules in self.columns.items():
+            if col_name not in data.schema or rules["dtype"] is None:
+                continue
+            if rules["dtype"] == pl.String:
+                if data.schema[col_name] == pl.String:
+                    string_columns.append(col_name)
+            elif data.schema[col_name] != rules["dtype"]:
+                casts.append(pl.col(col_name).cast(rules["dtype"]))
+
+        if string_columns and data.height:
+            unique_counts = data.select(pl.col(string_columns).n_unique()).row(
+                0, named=True
+            )
+            casts.extend(
+                pl.col(col_name).cast(pl.Categorical)
+                for col_name, unique_count in unique_counts.items()
+                if unique_count <= categorical_max_ratio * data.height
+            )
+
+        return data.with_columns(casts) if casts else data
@@ -1,12 +1,29 @@
+import contextlib
 import json
+import multiprocessing
 import os
 import sys
+import tempfile
 import polars as pl
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from colorama import Fore, Style, init
 from datetime import datetime
 
 sys.path.append(os.getcwd())
 from config import config as cfg  # noqa: E402
+from src.elt_integrations_project.aggregate.c_aggregate_data import (  # noqa: E402
+    c_aggregate_data,
+)
+from src.elt_integrations_project.transform.c_json_stream_reader import (  # noqa: E402
+    c_json_stream_reader,
+)
+from src.elt_integrations_project.transform.c_row_hash_index import (  # noqa: E402
+    c_row_hash_index,
+)
+from src.elt_integrations_project.transform.c_schema_validator import (  # noqa: E402
+    TRANSFORM_ERROR_COLUMN,
+    c_schema_validator,
+)
 
 # Initialize colorama
 init(autoreset=True)
@@ -19,8 +36,76 @@ class c_transform_data:
         self.landing_dir = cfg.LANDING_DATA_DIR
         self.staging_dir = cfg.STAGING_DATA_DIR
         self.log_dir = cfg.LOG_DIR
+        self.batch_mode = cfg.TRANSFORM_CONFIG["batch_mode"]
+        self.staging_format = cfg.TRANSFORM_CONFIG["staging_format"]
+        self.max_workers = cfg.TRANSFORM_CONFIG["max_workers"] or os.cpu_count()
+        # Set in pool workers: logs are collected here and written by the parent
+        self.log_records = None
+        self.transform_specs = {}
+        self.change_detection = cfg.TRANSFORM_CONFIG["change_detection"]
+        self.row_hash_dir = cfg.ROW_HASH_DIR
+        self.validate = cfg.TRANSFORM_CONFIG["validate_schema"]
+        self.optimize = cfg.TRANSFORM_CONFIG["optimize_dtypes"]
+        self.quarantine_dir = cfg.QUARANTINE_DATA_DIR
+        self.schema_validators = {}
+        # JSON landing documents are streamed into NDJSON spools before scanning
+        self.json_batch_size = cfg.TRANSFORM_CONFIG["json_batch_size"]
+        self.spool_dir = cfg.SPOOL_DIR
+        self.spool_files = []
+        self.aggregate = cfg.AGGREGATE_CONFIG["enabled"]
+        self.aggregator = c_aggregate_data()
 
     def process_all_files(self):
+        work_units = self.get_work_units()
+        if self.max_workers <= 1 or len(work_units) <= 1:
+            for dataset_name, file_paths in work_units:
+                self.process_work_unit(dataset_name, file_paths)
+            return
+
+        # Polars' thread pool is not fork-safe, so workers are spawned
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(run_work_unit, self, dataset_name, file_paths): (
+                    dataset_name,
+                    file_paths,
+                )
+                for dataset_name, file_paths in work_units
+            }
+            for future in as_completed(futures):
+                dataset_name, file_paths = futures[future]
+                try:
+                    log_records = future.result()
+                except Exception as e:
+                    # The worker died before it could report, e.g. out of memory
+                    print(f"{Fore.RED}Transform worker for {dataset_name} failed: {e}")
+                    for file_path in file_paths:
+                        self.create_log_file(
+                            dataset_name, file_path, None, success=False, error=str(e)
+                        )
+                    continue
+
+                for log_file_path, log_data in log_records:
+                    self.write_log_file(log_file_path, log_data)
+
+    def process_work_unit(self, dataset_name, file_paths):
+        if self.batch_mode:
+            self.process_dataset_batch(dataset_name, file_paths)
+            return
+
+        for file_path in file_paths:
+            self.process_single_file(dataset_name, file_path)
+
+    def get_work_units(self):
+        """
+        Returns (dataset_name, file_paths) units of work, one per dataset. Files of
+        a dataset share its staging directory and row hash index, so they are
+        never transformed in parallel; outside batch mode the unit's worker
+        processes them one after the other.
+        """
+        work_units = []
         for dataset_name in self.dataset_config:
             landing_path = os.path.join(self.landing_dir, dataset_name)
             if not os.path.exists(landing_path):
@@ -29,106 +114,224 @@ class c_transform_data:
                 )
                 continue
 
-            for root, _, files in os.walk(landing_path):
-                for file in files:
-                    if file.endswith(".json"):
-                        file_path = os.path.join(root, file)
-                        self.process_single_file(dataset_name, file_path)
+            file_paths = sorted(
+                os.path.join(root, file)
+                for root, _, files in os.walk(landing_path)
+                for file in files
+                if file.endswith(cfg.LANDING_FILE_EXTENSIONS)
+            )
+
+            if file_paths:
+                work_units.append((dataset_name, file_paths))
+
+        return work_units
 
     def process_single_file(self, dataset_name, file_path):
+        """
+        Transforms and stages one landing file. Returns True when the file was
+        staged and removed from landing.
+        """
         try:
             # Load data
             self.get_data_file(file_path)
 
             # Transform data
-            transformed_data = self.transform_data()
+            transformed_data = self.transform_data(dataset_name)
 
             if transformed_data is not None:
-                # Save transformed data
-                output_path = self.save_data(dataset_name, file_path)
-
-                if output_path:
-                    # Create log file
-                    self.create_log_file(
-                        dataset_name, file_path, output_path, success=True
-                    )
-
-                    # Delete original file
-                    os.remove(file_path)
-                    print(
-                        f"{Fore.GREEN}Successfully processed and deleted: {file_path}"
-                    )
-                else:
-                    self.create_log_file(dataset_name, file_path, None, success=False)
-            else:
-                self.create_log_file(dataset_name, file_path, None, success=False)
+                # Run the whole plan once
+                self.collect_data(file_path)
+
+                # Validate, drop unchanged rows and save the rest
+                output_path = self.stage_data(dataset_name, file_path)
+
+                # Create log file
+                self.create_log_file(dataset_name, file_path, output_path, success=True)
+
+                # Delete original file
+                os.remove(file_path)
+                print(f"{Fore.GREEN}Successfully processed and deleted: {file_path}")
+                return True
+
+            self.create_log_file(dataset_name, file_path, None, success=False)
+            return False
 
         except Exception as e:
             print(f"{Fore.RED}Error processing file {file_path}: {str(e)}")
             self.create_log_file(
                 dataset_name, file_path, None, success=False, error=str(e)
             )
+            return False
+        finally:
+            self.remove_spool_files()
+
+    def process_dataset_batch(self, dataset_name, file_paths):
+        """
+        Transforms every pending landing file of a dataset as one lazy plan and
+        writes a single staging file. Paths are sorted oldest first
+        ('yyyymmdd/HHMM'), so when the same Id was landed more than once the
+        newest record wins. If the combined plan fails, the files are retried one
+        at a time and only the ones that still fail are quarantined.
+        """
+        frames, loaded_paths = [], []
+        for file_path in file_paths:
+            frame = self.get_data_file(file_path)
+            if frame is None:
+                self.create_log_file(dataset_name, file_path, None, success=False)
+                continue
+            frames.append(frame)
+            loaded_paths.append(file_path)
+
+        if not frames:
+            return
 
-    def get_data_file(self, file_path):
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                json_data = json.load(file)
-                value_data = json_data.get("value", [])
+            # NDJSON scans infer their own schemas; align them column by column
+            self.data = pl.concat(frames, how="diagonal_relaxed")
+            if "Id" in self.data.collect_schema().names():
+                self.data = self.data.unique(
+                    subset="Id", keep="last", maintain_order=True
+                )
+
+            transformed_data = self.transform_data(dataset_name)
+            if transformed_data is None:
+                raise ValueError(f"Transformation failed for dataset {dataset_name}")
+
+            self.collect_data(", ".join(loaded_paths))
+
+            # The newest file decides where the staging output goes
+            output_path = self.stage_data(dataset_name, loaded_paths[-1])
+
+        except Exception as e:
+            print(
+                f"{Fore.YELLOW}Batch for {dataset_name} failed ({str(e)}); retrying file by file"
+            )
+            self.remove_spool_files()
+            # Oldest first, so the newest record per Id still wins
+            for file_path in loaded_paths:
+                if not self.process_single_file(dataset_name, file_path):
+                    self.quarantine_landing_file(file_path)
+            return
+        finally:
+            self.remove_spool_files()
+
+        for file_path in loaded_paths:
+            self.create_log_file(dataset_name, file_path, output_path, success=True)
+            os.remove(file_path)
+        print(
+            f"{Fore.GREEN}Successfully processed and deleted {len(loaded_paths)} files for {dataset_name}"
+        )
 
-                if not value_data:
-                    raise ValueError(
-                        f"No 'value' key found in the JSON file: {file_path}"
-                    )
+    def quarantine_landing_file(self, file_path):
+        """
+        Moves a landing file that cannot be transformed to the quarantine
+        directory, mirroring the landing layout, so it no longer blocks the
+        dataset's batch.
+        """
+        relative_path = os.path.relpath(file_path, self.landing_dir)
+        quarantine_path = os.path.join(self.quarantine_dir, relative_path)
+        os.makedirs(os.path.dirname(quarantine_path), exist_ok=True)
+        os.replace(file_path, quarantine_path)
+        print(f"{Fore.YELLOW}Quarantined landing file {file_path} to {quarantine_path}")
+        return quarantine_path
 
-            self.data = pl.DataFrame(value_data)
+    def get_data_file(self, file_path):
+        """
+        Returns a LazyFrame over the landing file. Nothing is read until the plan is
+        collected, so projection pushdown and the transform steps run as one query.
+        """
+        try:
+            if not file_path.endswith(".json"):
+                # NDJSON landing files (plain, .gz or .zst) are scanned natively by
+                # polars, which decompresses and parses without Python dicts. The
+                # schema is inferred from every row: GHO columns such as Comments
+                # are often null for the first hundred rows
+                self.data = pl.scan_ndjson(file_path, infer_schema_length=None)
+                return self.data
+
+            self.data = pl.scan_ndjson(
+                self.spool_json_file(file_path), infer_schema_length=None
+            )
             return self.data
 
         except Exception as e:
             print(f"{Fore.RED}Error loading data: {str(e)}")
             return None
 
-    def transform_data(self):
+    def spool_json_file(self, file_path):
+        """
+        Streams the 'value' records of a JSON landing document into a temporary
+        NDJSON file, one batch at a time, so the document is never held in memory.
+        Returns the spool path; spools are removed by remove_spool_files.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        spool_fd, spool_path = tempfile.mkstemp(suffix=".ndjson", dir=self.spool_dir)
+        self.spool_files.append(spool_path)
+
+        record_count = 0
+        reader = c_json_stream_reader(file_path)
+        with os.fdopen(spool_fd, "w", encoding="utf-8") as spool:
+            for batch in reader.iter_batches(self.json_batch_size):
+                spool.writelines(
+                    json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                    for record in batch
+                )
+                record_count += len(batch)
+
+        if not record_count:
+            raise ValueError(f"No 'value' key found in the JSON file: {file_path}")
+        return spool_path
+
+    def remove_spool_files(self):
+        for spool_path in self.spool_files:
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+        self.spool_files = []
+
+    def get_transform_spec(self, dataset_name):
+        # Compiled on first use and reused for every later file of the dataset
+        if dataset_name not in self.transform_specs:
+            spec = self.dataset_config[dataset_name].get("transform")
+            if spec is None:
+                raise ValueError(
+                    f"{Fore.RED}Dataset '{dataset_name}' has no 'transform' section in the config.{Fore.RESET}"
+                )
+            self.transform_specs[dataset_name] = compile_transform_spec(spec)
+        return self.transform_specs[dataset_name]
+
+    def transform_data(self, dataset_name):
         try:
             # Get current epoch time in seconds
             current_epoch = int(datetime.now().timestamp())
 
-            self.data = self.data.with_columns(
+            spec = self.get_transform_spec(dataset_name)
+
+            data = self.data.lazy()
+            columns = data.collect_schema().names()
+            # Casts are lenient; values they could not convert are recorded in
+            # TRANSFORM_ERROR_COLUMN and quarantined by the schema validator
+            failed_checks = [
+                (reason, failed)
+                for source, reason, failed in spec["checks"]
+                if source in columns
+            ]
+            data = data.with_columns(
                 [
-                    pl.col("SpatialDim").alias("country"),
-                    pl.col("Dim1").alias("sex"),
                     pl.lit(current_epoch).alias("transformed_epoch"),
-                    pl.col("NumericValue").cast(pl.Float64),
-                    pl.col("TimeDim").cast(pl.Int64),
-                    pl.col("Date")
-                    .str.strptime(pl.Datetime, "%Y-%m-%dT%H:%M:%S%.f%z")
-                    .dt.strftime("%Y-%m-%dT%H:%M:%S%z"),
-                    pl.col("TimeDimensionBegin")
-                    .str.strptime(pl.Datetime, "%Y-%m-%dT%H:%M:%S%z")
-                    .dt.strftime("%Y-%m-%dT%H:%M:%S%z"),
-                    pl.col("TimeDimensionEnd")
-                    .str.strptime(pl.Datetime, "%Y-%m-%dT%H:%M:%S%z")
-                    .dt.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    *[
+                        expr
+                        for source, expr in spec["expressions"]
+                        if source in columns
+                    ],
+                    get_transform_error_expr(failed_checks),
                 ]
             )
 
-            columns_to_drop = [
-                "Dim2Type",
-                "Dim2",
-                "Dim3Type",
-                "Dim3",
-                "DataSourceDimType",
-                "DataSourceDim",
-                "Value",
-                "High",
-                "Low",
-                "SpatialDimType",
-            ]
-            self.data = self.data.drop(
-                [col for col in columns_to_drop if col in self.data.columns]
-            )
+            columns = data.collect_schema().names()
+            data = data.drop([col for col in spec["drop"] if col in columns])
 
-            self.data = self.data.rename(
-                {col: col.lower() for col in self.data.columns}
+            self.data = data.rename(
+                {col: col.lower() for col in columns if col not in spec["drop"]}
             )
 
             return self.data
@@ -137,29 +340,205 @@ class c_transform_data:
             print(f"{Fore.RED}Error during transformation: {str(e)}")
             return None
 
-    def save_data(self, dataset_name, input_file_path):
-        indicator_config = self.dataset_config.get(dataset_name)
-        if not indicator_config:
-            raise ValueError(
-                f"{Fore.RED}Indicator '{dataset_name}' not found in the extraction config.{Fore.RESET}"
+    def collect_data(self, file_path):
+        """
+        Executes the lazy plan on the configured engine ("streaming" processes the
+        input in batches, so files larger than RAM can be transformed).
+        """
+        self.data = self.data.collect(engine=cfg.TRANSFORM_CONFIG["engine"])
+        if self.data.is_empty():
+            raise ValueError(f"No records found in the file: {file_path}")
+        return self.data
+
+    def get_row_hash_index(self, dataset_name):
+        # Hash with the staging_schema dtypes, not whatever polars inferred
+        validator = self.get_schema_validator(dataset_name)
+        column_dtypes = (
+            {
+                col_name: rules["dtype"]
+                for col_name, rules in validator.columns.items()
+                if rules["dtype"] is not None
+            }
+            if validator
+            else None
+        )
+        return c_row_hash_index(
+            os.path.join(self.row_hash_dir, f"{dataset_name}.parquet"),
+            column_dtypes=column_dtypes,
+        )
+
+    def filter_changed_rows(self, dataset_name):
+        """
+        Drops rows whose hash matches the dataset's row hash index and returns the
+        (id, row_hash) pairs to commit once staging is written. None when change
+        detection is off. If the staging_schema has a 'row_hash' column, the hash
+        is kept on the rows for the loader.
+        """
+        row_hash_index = self.get_row_hash_index(dataset_name)
+        staging_schema = self.dataset_config[dataset_name].get("staging_schema", {})
+        store_hash = "row_hash" in dict(staging_schema.get("columns", []))
+
+        changed_hashes = None
+        if self.change_detection:
+            row_count = self.data.height
+            self.data, changed_hashes = row_hash_index.filter_changed(
+                self.data, keep_hash=store_hash
+            )
+            print(
+                f"{Fore.CYAN}{dataset_name}: {self.data.height} of {row_count} rows new or changed"
+            )
+        elif store_hash:
+            self.data = row_hash_index.add_row_hashes(self.data)
+
+        if store_hash:
+            # Stored in a BIGINT column: same 64 bits, read as signed
+            self.data = self.data.with_columns(
+                pl.col("row_hash").reinterpret(signed=True)
+            )
+        return changed_hashes
+
+    def commit_row_hashes(self, dataset_name, changed_hashes):
+        if changed_hashes is not None:
+            self.get_row_hash_index(dataset_name).commit(changed_hashes)
+
+    def lock_row_hashes(self, dataset_name):
+        if not self.change_detection:
+            return contextlib.nullcontext()
+        return self.get_row_hash_index(dataset_name).lock()
+
+    def stage_data(self, dataset_name, input_file_path):
+        """
+        Quarantines rows failing staging_schema validation, drops rows unchanged
+        since the last snapshot, narrows dtypes and saves the rest. Returns the
+        staging path, or None when no rows needed staging.
+        """
+        self.quarantine_invalid_rows(dataset_name, input_file_path)
+
+        # Hashes are only committed for rows this run staged
+        with self.lock_row_hashes(dataset_name):
+            changed_hashes = self.filter_changed_rows(dataset_name)
+            if self.data.is_empty():
+                print(f"{Fore.YELLOW}{dataset_name}: nothing new to stage")
+                return None
+
+            # After hashing: categorical codes are not stable between runs
+            self.optimize_dtypes(dataset_name)
+
+            output_path = self.save_data(dataset_name, input_file_path)
+            if not output_path:
+                raise ValueError(f"Could not save staging data for {dataset_name}")
+
+            self.commit_row_hashes(dataset_name, changed_hashes)
+
+        self.update_metrics(dataset_name)
+        return output_path
+
+    def update_metrics(self, dataset_name):
+        """
+        Feeds the staged delta to the aggregate stage. A metrics failure is
+        reported but does not fail the transform; 'rebuild' can catch up later.
+        """
+        if not self.aggregate or not self.aggregator.can_aggregate(self.data):
+            return
+        try:
+            series_count = self.aggregator.update(dataset_name, self.data)
+            print(
+                f"{Fore.CYAN}{dataset_name}: refreshed metrics for {series_count} series"
+            )
+        except Exception as e:
+            print(f"{Fore.YELLOW}Could not update metrics for {dataset_name}: {str(e)}")
+
+    def get_schema_validator(self, dataset_name):
+        # Parsed on first use, like the transform specs
+        if dataset_name not in self.schema_validators:
+            staging_schema = self.dataset_config[dataset_name].get("staging_schema")
+            self.schema_validators[dataset_name] = (
+                c_schema_validator(staging_schema) if staging_schema else None
             )
+        return self.schema_validators[dataset_name]
+
+    def quarantine_invalid_rows(self, dataset_name, input_file_path):
+        """
+        Splits rows failing the staging_schema checks off self.data into a
+        quarantine file, so one bad row no longer fails the whole load.
+        """
+        validator = self.get_schema_validator(dataset_name) if self.validate else None
+        if validator is None:
+            if TRANSFORM_ERROR_COLUMN in self.data.columns:
+                self.data = self.data.drop(TRANSFORM_ERROR_COLUMN)
+            return None
+
+        self.data, quarantined = validator.split(self.data)
+        if quarantined.is_empty():
+            return None
+
+        quarantine_path = self.get_output_path(self.quarantine_dir, input_file_path)
+        self.write_data(quarantined, quarantine_path)
+        print(
+            f"{Fore.YELLOW}{dataset_name}: {quarantined.height} invalid rows quarantined to {quarantine_path}"
+        )
+        return quarantine_path
+
+    def optimize_dtypes(self, dataset_name):
+        validator = self.get_schema_validator(dataset_name)
+        if validator is None or not self.optimize:
+            return
+        self.data = validator.optimize_dtypes(
+            self.data, cfg.TRANSFORM_CONFIG["categorical_max_ratio"]
+        )
 
-        current_time = datetime.now()
-        hour_minute = current_time.strftime("%H%M")
+    def get_output_path(self, base_dir, input_file_path):
+        """
+        Mirrors the landing layout, e.g. <base_dir>/<dataset>/<yyyymmdd>/HHMM.parquet.
+        The file is created empty to reserve its name; a name taken earlier in
+        the same minute gets a '_<n>' suffix instead of being overwritten.
+        """
+        hour_minute = datetime.now().strftime("%H%M")
 
         relative_path = os.path.relpath(input_file_path, self.landing_dir)
-        output_dir = os.path.join(self.staging_dir, os.path.dirname(relative_path))
+        output_dir = os.path.join(base_dir, os.path.dirname(relative_path))
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        output_file_path = os.path.join(output_dir, f"{hour_minute}.json")
+        extension = cfg.STAGING_FILE_EXTENSIONS[self.staging_format]
+        file_name, suffix = hour_minute, 0
+        while True:
+            output_path = os.path.join(output_dir, f"{file_name}{extension}")
+            try:
+                os.close(os.open(output_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return output_path
+            except FileExistsError:
+                suffix += 1
+                file_name = f"{hour_minute}_{suffix}"
+
+    def write_data(self, data, output_file_path):
+        # Columnar formats keep the dtypes and skip per-row dicts entirely
+        try:
+            if self.staging_format == "parquet":
+                data.write_parquet(output_file_path, compression="zstd")
+            elif self.staging_format == "ipc":
+                data.write_ipc(output_file_path, compression="zstd")
+            else:
+                # Row list; typed datetimes are written as ISO strings
+                data.write_json(output_file_path)
+        except Exception:
+            # Do not leave the reserved, empty file behind for the loader
+            if os.path.exists(output_file_path):
+                os.remove(output_file_path)
+            raise
 
-        rows = self.data.to_dicts()
+    def save_data(self, dataset_name, input_file_path):
+        indicator_config = self.dataset_config.get(dataset_name)
+        if not indicator_config:
+            raise ValueError(
+                f"{Fore.RED}Indicator '{dataset_name}' not found in the extraction config.{Fore.RESET}"
+            )
+
+        output_file_path = self.get_output_path(self.staging_dir, input_file_path)
 
         try:
-            with open(output_file_path, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, indent=2)
+            self.write_data(self.data, output_file_path)
             return output_file_path
         except Exception as e:
             print(f"{Fore.RED}Error saving data: {str(e)}")
@@ -174,10 +553,7 @@ class c_transform_data:
             self.log_dir, "transform", os.path.dirname(relative_path)
         )
 
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
-        log_file_name = f"{os.path.splitext(os.path.basename(input_file_path))[0]}.json"
+        log_file_name = f"{os.path.basename(input_file_path).split('.')[0]}.json"
         log_file_path = os.path.join(log_dir, log_file_name)
 
         log_data = {
@@ -189,6 +565,17 @@ class c_transform_data:
             "schema": self.get_schema_str() if success else None,
         }
 
+        if self.log_records is not None:
+            self.log_records.append((log_file_path, log_data))
+            return
+
+        self.write_log_file(log_file_path, log_data)
+
+    def write_log_file(self, log_file_path, log_data):
+        log_dir = os.path.dirname(log_file_path)
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
         with open(log_file_path, "w") as log_file:
             json.dump(log_data, log_file, indent=2)
 
@@ -198,6 +585,91 @@ class c_transform_data:
         return str(self.data.schema)
 
 
+def compile_transform_spec(spec):
+    """
+    Compiles a dataset's declarative 'transform' config into polars expressions.
+    Returns {"expressions": [(source_column, expr), ...], "checks": [(source_column,
+    reason, failed_expr), ...], "drop": [...]}; each expression and check is
+    applied only when its source column is present. A check fails for a value
+    that was set but could not be converted.
+    """
+    expressions, checks = [], []
+    for target, source in spec.get("aliases", {}).items():
+        expressions.append((source, pl.col(source).alias(target)))
+
+    for column, dtype_name in spec.get("casts", {}).items():
+        dtype = getattr(pl, dtype_name, None)
+        if dtype is None:
+            raise ValueError(
+                f"{Fore.RED}Unknown polars dtype '{dtype_name}' for column '{column}'.{Fore.RESET}"
+            )
+        converted = pl.col(column).cast(dtype, strict=False)
+        expressions.append((column, converted))
+        checks.append(
+            (
+                column,
+                f"{column.lower()}: not {dtype_name}",
+                pl.col(column).is_not_null() & converted.is_null(),
+            )
+        )
+
+    for column, input_format in spec.get("datetimes", {}).items():
+        # Offsets are normalized to UTC on parse; the result stays a typed naive
+        # Datetime to match the TIMESTAMP staging columns
+        converted = (
+            pl.col(column)
+            .str.strptime(pl.Datetime("us"), input_format, strict=False)
+            .dt.replace_time_zone(None)
+        )
+        expressions.append((column, converted))
+        checks.append(
+            (
+                column,
+                f"{column.lower()}: not {input_format}",
+                pl.col(column).is_not_null() & converted.is_null(),
+            )
+        )
+
+    return {
+        "expressions": expressions,
+        "checks": checks,
+        "drop": list(spec.get("drop", [])),
+    }
+
+
+def get_transform_error_expr(failed_checks):
+    """
+    The TRANSFORM_ERROR_COLUMN expression: the reasons of every failed check,
+    or null for rows that converted cleanly.
+    """
+    if not failed_checks:
+        return pl.lit(None, dtype=pl.String).alias(TRANSFORM_ERROR_COLUMN)
+    return (
+        pl.when(pl.any_horizontal([failed for _, failed in failed_checks]))
+        .then(
+            pl.concat_str(
+                [
+                    pl.when(failed).then(pl.lit(reason))
+                    for reason, failed in failed_checks
+                ],
+                separator="; ",
+                ignore_nulls=True,
+            )
+        )
+        .alias(TRANSFORM_ERROR_COLUMN)
+    )
+
+
+def run_work_unit(transformer, dataset_name, file_paths):
+    """
+    Process pool entry point. Runs one unit of work on a copy of the parent's
+    transformer and returns its (log_file_path, log_data) records.
+    """
+    transformer.log_records = []
+    transformer.process_work_unit(dataset_name, file_paths)
+    return transformer.log_records
+
+
 # Example usage
 if __name__ == "__main__":
     transformer = c_transform_data()
@@ -0,0 +1,79 @@
+from src.elt_integrations_project.aggregate.c_aggregate_data import c_aggregate_data
+import polars as pl
+import tempfile
+import unittest
+
+
+def staged_rows(rows):
+    return pl.DataFrame(
+        rows,
+        schema=["id", "country", "sex", "parentlocation", "timedim", "numericvalue"],
+        orient="row",
+    )
+
+
+class TestCAggregateData(unittest.TestCase):
+    def test_update_computes_series_and_regional_metrics(self):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            aggregator = c_aggregate_data(metrics_dir)
+            aggregator.rolling_window_years = 2
+            aggregator.update(
+                "dataset",
+                staged_rows(
+                    [
+                        (1, "ZAF", "SEX_MLE", "Africa", 2000, 60.0),
+                        (2, "ZAF", "SEX_MLE", "Africa", 2001, 62.0),
+                        (3, "ZAF", "SEX_MLE", "Africa", 2003, 63.0),
+                        (4, "BWA", "SEX_MLE", "Africa", 2000, 50.0),
+                    ]
+                ),
+            )
+
+            series = aggregator.read_frame("dataset", "series_metrics")
+            zaf = series.filter(pl.col("country") == "ZAF")
+            self.assertEqual(zaf["rolling_avg_2y"].to_list(), [60.0, 61.0, 63.0])
+            # 2003 follows a gap, so there is no year-over-year delta
+            self.assertEqual(zaf["yoy_delta"].to_list(), [None, 2.0, None])
+
+            regional = aggregator.read_frame("dataset", "regional_metrics")
+            row_2000 = regional.filter(pl.col("timedim") == 2000).row(0, named=True)
+            self.assertEqual(row_2000["regional_mean"], 55.0)
+            self.assertEqual(row_2000["series_count"], 2)
+
+    def test_update_only_recomputes_affected_series(self):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            aggregator = c_aggregate_data(metrics_dir)
+            aggregator.update(
+                "dataset",
+                staged_rows(
+                    [
+                        (1, "ZAF", "SEX_MLE", "Africa", 2000, 60.0),
+                        (2, "ZAF", "SEX_MLE", "Africa", 2001, 62.0),
+                        (3, "BWA", "SEX_MLE", "Africa", 2000, 50.0),
+                    ]
+                ),
+            )
+
+            # A revised value for one ZAF year arrives as a delta
+            refreshed = aggregator.update(
+                "dataset", staged_rows([(2, "ZAF", "SEX_MLE", "Africa", 2001, 64.0)])
+            )
+
+            self.assertEqual(refreshed, 1)
+            series = aggregator.read_frame("dataset", "series_metrics")
+            self.assertEqual(series.height, 3)
+            zaf_2001 = series.filter(
+                (pl.col("country") == "ZAF") & (pl.col("timedim") == 2001)
+            ).row(0, named=True)
+            self.assertEqual(zaf_2001["yoy_delta"], 4.0)
+
+            regional = aggregator.read_frame("dataset", "regional_metrics")
+            self.assertEqual(
+                regional.filter(pl.col("timedim") == 2001)["regional_mean"].to_list(),
+                [64.0],
+            )
+            self.assertEqual(aggregator.read_frame("dataset", "base").height, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
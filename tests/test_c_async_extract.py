@@ -0,0 +1,130 @@
+from src.elt_integrations_project.extract.c_extract_data import c_extract_data
+from src.elt_integrations_project.extract.c_async_extract import c_async_extract
+from utils.gho_standin_server import GhoStandinServer
+import json
+import tempfile
+import threading
+import time
+import unittest
+
+
+class TestCAsyncExtract(unittest.TestCase):
+    def test_extract_all_fetches_pages_concurrently(self):
+        """
+        Test that every page of every indicator is landed, with no more requests in
+        flight than the per-host cap.
+        """
+        dataset_config = {
+            "indicator_a": {"code": "A", "filters": {}},
+            "indicator_b": {"code": "B", "filters": {}},
+        }
+        in_flight = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def fake_fetch_page(url, params):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            skip = params["$skip"]
+            return {
+                "value": [{"Id": f"{url}-{skip + i}"} for i in range(2)],
+                "@odata.count": 6,
+            }
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config, "https://example.com/api/", {}, output_dir, 2
+            )
+            extractor.fetch_page = fake_fetch_page
+            extractor.fetch_first_page = lambda key, url, params: (
+                fake_fetch_page(url, params),
+                {},
+            )
+            results = c_async_extract(extractor, max_concurrency_per_host=2).run()
+
+            for output_file in results.values():
+                with open(output_file) as f:
+                    self.assertEqual(len(json.load(f)["value"]), 6)
+
+        self.assertLessEqual(in_flight["max"], 2)
+
+    def test_extract_all_steps_by_server_capped_page_size(self):
+        """
+        Test that no records are lost when the server returns fewer rows per page
+        than $top.
+        """
+        server = GhoStandinServer({"port": 0, "latency_ms": 0, "max_page_size": 10})
+        server.start()
+        try:
+            dataset_config = {
+                "test_indicator": {
+                    "code": "WHOSIS_000001",
+                    "filters": {"SpatialDim": ["ZAF", "BWA"]},
+                }
+            }
+            with tempfile.TemporaryDirectory() as output_dir:
+                extractor = c_extract_data(
+                    dataset_config, server.base_url, {}, output_dir, page_size=25
+                )
+                results = c_async_extract(extractor).run()
+                with open(results["test_indicator"]) as f:
+                    records = json.load(f)["value"]
+        finally:
+            server.stop()
+
+        # 2 countries x 3 sexes x 22 years
+        self.assertEqual(len({record["Id"] for record in records}), 132)
+
+    def test_extract_all_pages_capped_results_without_count(self):
+        """
+        Test that paging without @odata.count or a next link continues past
+        pages shorter than $top and stops at the first empty page.
+        """
+        records = [{"Id": i} for i in range(5)]
+
+        def fake_fetch_page(url, params):
+            # The server caps $top at 2 and sends neither a count nor a next link
+            skip = params["$skip"]
+            return {"value": records[skip : skip + 2]}
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                {"indicator_a": {"code": "A", "filters": {}}},
+                "https://example.com/api/",
+                {},
+                output_dir,
+                10,
+            )
+            extractor.fetch_page = fake_fetch_page
+            extractor.fetch_first_page = lambda key, url, params: (
+                fake_fetch_page(url, params),
+                {},
+            )
+            results = c_async_extract(extractor).run()
+            with open(results["indicator_a"]) as f:
+                landed = json.load(f)["value"]
+
+        self.assertEqual(landed, records)
+
+    def test_extract_all_reports_failed_indicator(self):
+        """
+        Test that one failing indicator does not stop the others.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                {"indicator_a": {"code": "A", "filters": {}}},
+                "https://example.com/api/",
+                {},
+                output_dir,
+            )
+            extractor.fetch_first_page = lambda key, url, params: ({"value": []}, {})
+            results = c_async_extract(extractor).run(["indicator_a", "missing"])
+
+        self.assertIsInstance(results["missing"], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
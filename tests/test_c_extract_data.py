@@ -1,7 +1,36 @@
 from src.etl_integrations_project_lydon.extract.c_extract_data import (
     c_extract_data,
 )
+from src.etl_integrations_project_lydon.extract.c_state_store import c_state_store
+import gzip
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
 import unittest
+from unittest.mock import MagicMock
+
+
+def mock_response(payload, status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    return response
+
+
+def first_page_only(payload):
+    """
+    A client.get side effect serving 'payload' at $skip 0 and an empty page
+    after it, where paging stops.
+    """
+
+    def get(url, params=None, headers=None):
+        if params and params.get("$skip"):
+            return mock_response({"value": []})
+        return mock_response(payload)
+
+    return get
 
 
 class TestCExtractData(unittest.TestCase):
@@ -25,7 +54,384 @@ class TestCExtractData(unittest.TestCase):
                 f"c_extract_data raised an exception during instantiation: {str(e)}"
             )
 
-    # There should be unit tests for each function in the class.
+    def test_iter_pages_uses_top_and_skip(self):
+        """
+        Test that pages are requested with $top/$skip until an empty page is
+        returned, stepping by the rows each page actually held.
+        """
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response({"value": [{"Id": 1}, {"Id": 2}]}),
+            mock_response({"value": [{"Id": 3}]}),
+            mock_response({"value": []}),
+        ]
+        extractor = c_extract_data(
+            {}, "https://example.com/api/", {}, "/tmp/data", 2, mock_client
+        )
+        pages = list(
+            extractor.iter_pages("https://example.com/api/X", {"$top": 2, "$skip": 0})
+        )
+
+        self.assertEqual(pages, [[{"Id": 1}, {"Id": 2}], [{"Id": 3}], []])
+        self.assertEqual(mock_client.get.call_count, 3)
+        self.assertEqual(mock_client.get.call_args_list[1].kwargs["params"]["$skip"], 2)
+        self.assertEqual(mock_client.get.call_args_list[2].kwargs["params"]["$skip"], 3)
+
+    def test_iter_pages_follows_next_link(self):
+        """
+        Test that '@odata.nextLink' is followed when the server provides it.
+        """
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response({"value": [{"Id": 1}], "@odata.nextLink": "https://next"}),
+            mock_response({"value": [{"Id": 2}]}),
+        ]
+        extractor = c_extract_data(
+            {}, "https://example.com/api/", {}, "/tmp/data", 1, mock_client
+        )
+        pages = list(
+            extractor.iter_pages("https://example.com/api/X", {"$top": 1, "$skip": 0})
+        )
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(mock_client.get.call_args_list[1].args[0], "https://next")
+        self.assertIsNone(mock_client.get.call_args_list[1].kwargs["params"])
+
+    def test_get_data_streams_pages_to_landing_file(self):
+        """
+        Test that every page ends up in one valid landing JSON file.
+        """
+        dataset_config = {"test_indicator": {"code": "TEST_001", "filters": {}}}
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response({"value": [{"Id": 1}, {"Id": 2}]}),
+            mock_response({"value": [{"Id": 3}]}),
+            mock_response({"value": []}),
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                2,
+                mock_client,
+            )
+            output_file = extractor.get_data("test_indicator")
+
+            with open(output_file) as f:
+                self.assertEqual(
+                    json.load(f), {"value": [{"Id": 1}, {"Id": 2}, {"Id": 3}]}
+                )
+
+    def test_runs_in_the_same_minute_do_not_overwrite_landing_files(self):
+        """
+        Test that a second extract landing within the same minute gets its own
+        file instead of replacing the first.
+        """
+        dataset_config = {"test_indicator": {"code": "TEST_001", "filters": {}}}
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response({"value": [{"Id": 1}]}),
+            mock_response({"value": []}),
+            mock_response({"value": [{"Id": 2}]}),
+            mock_response({"value": []}),
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                2,
+                mock_client,
+            )
+            first_file = extractor.get_data("test_indicator")
+            second_file = extractor.get_data("test_indicator")
+
+            self.assertNotEqual(first_file, second_file)
+            self.assertTrue(second_file.endswith("_1.json"))
+            with open(first_file) as f:
+                self.assertEqual(json.load(f), {"value": [{"Id": 1}]})
+            with open(second_file) as f:
+                self.assertEqual(json.load(f), {"value": [{"Id": 2}]})
+
+    def test_construct_filter_query_formats_scalar_literals(self):
+        extractor = c_extract_data({}, "https://example.com/api/", {}, "/tmp/data")
+        filter_query = extractor.construct_filter_query(
+            {
+                "SpatialDim": ["ZAF", "BWA"],
+                "Date": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                "TimeDim": 2000,
+            }
+        )
+        self.assertEqual(
+            filter_query,
+            "(SpatialDim eq 'ZAF' or SpatialDim eq 'BWA') and "
+            "Date ge 2024-01-01T00:00:00Z and TimeDim ge 2000",
+        )
+
+    def test_get_data_applies_and_advances_watermark(self):
+        """
+        Test that the stored watermark is added to $filter and moved forward to the
+        latest Date landed.
+        """
+        dataset_config = {
+            "test_indicator": {
+                "code": "TEST_001",
+                "filters": {},
+                "watermark_field": "Date",
+                "DataFreshnessDays": 30,
+            }
+        }
+        mock_client = MagicMock()
+        mock_client.get.side_effect = first_page_only(
+            {
+                "value": [
+                    {"Id": 1, "Date": "2024-05-01T10:00:00+02:00"},
+                    {"Id": 2, "Date": "2024-06-01T10:00:00.5+02:00"},
+                ]
+            }
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            state_store = c_state_store(os.path.join(output_dir, "state.json"))
+            state_store.update("test_indicator", watermark="2024-04-01T00:00:00+00:00")
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                http_client=mock_client,
+                state_store=state_store,
+            )
+            extractor.get_data("test_indicator")
+
+            params = mock_client.get.call_args.kwargs["params"]
+            self.assertEqual(params["$filter"], "Date ge 2024-04-01T00:00:00Z")
+            self.assertEqual(
+                state_store.get("test_indicator")["watermark"],
+                "2024-06-01T10:00:00.500000+02:00",
+            )
+
+    def test_first_run_uses_data_freshness_days(self):
+        dataset_config = {
+            "test_indicator": {
+                "code": "TEST_001",
+                "watermark_field": "Date",
+                "DataFreshnessDays": 30,
+            }
+        }
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                state_store=c_state_store(os.path.join(output_dir, "state.json")),
+            )
+            watermark = extractor.get_watermark("test_indicator")
+
+        age = datetime.now(timezone.utc) - watermark
+        self.assertEqual(age.days, 30)
+
+    def test_unchanged_payloads_are_not_landed(self):
+        """
+        Test that the ETag is sent back on the next run, a 304 lands nothing, and a
+        200 with identical content is discarded by the content hash.
+        """
+        dataset_config = {"test_indicator": {"code": "TEST_001", "filters": {}}}
+        payload = {"value": [{"Id": 1}, {"Id": 2}]}
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response(payload, headers={"ETag": 'W/"v1"'}),
+            mock_response({"value": []}),
+            mock_response(None, status_code=304),
+            mock_response(payload),
+            mock_response({"value": []}),
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                http_client=mock_client,
+                state_store=c_state_store(os.path.join(output_dir, "state.json")),
+            )
+
+            self.assertIsNotNone(extractor.get_data("test_indicator"))
+            self.assertIsNone(extractor.get_data("test_indicator"))
+            self.assertEqual(
+                mock_client.get.call_args.kwargs["headers"]["If-None-Match"],
+                'W/"v1"',
+            )
+            self.assertIsNone(extractor.get_data("test_indicator"))
+
+            landed = [
+                file
+                for _, _, files in os.walk(output_dir)
+                for file in files
+                if file.endswith(".json") and file != "state.json"
+            ]
+            self.assertEqual(len(landed), 1)
+
+    def test_multi_page_results_are_always_fetched_in_full(self):
+        """
+        Test that the ETag of a first page is not sent back when the result
+        spanned several pages, since it says nothing about the later pages.
+        """
+        dataset_config = {"test_indicator": {"code": "TEST_001", "filters": {}}}
+        mock_client = MagicMock()
+        mock_client.get.side_effect = [
+            mock_response({"value": [{"Id": 1}, {"Id": 2}]}, headers={"ETag": "v1"}),
+            mock_response({"value": [{"Id": 3}, {"Id": 4}]}),
+            mock_response({"value": []}),
+            mock_response({"value": [{"Id": 1}, {"Id": 2}]}, headers={"ETag": "v1"}),
+            mock_response({"value": [{"Id": 3}, {"Id": 4}]}),
+            mock_response({"value": [{"Id": 5}, {"Id": 6}]}),
+            mock_response({"value": []}),
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                page_size=2,
+                http_client=mock_client,
+                state_store=c_state_store(os.path.join(output_dir, "state.json")),
+            )
+            extractor.get_data("test_indicator")
+            output_file = extractor.get_data("test_indicator")
+
+            self.assertNotIn(
+                "If-None-Match", mock_client.get.call_args_list[3].kwargs["headers"]
+            )
+            with open(output_file) as f:
+                self.assertEqual(len(json.load(f)["value"]), 6)
+
+    def test_construct_select_query_from_staging_schema(self):
+        """
+        Test that $select covers the staging columns by their GHO names, including
+        aliased source columns, and skips columns created downstream.
+        """
+        extractor = c_extract_data({}, "https://example.com/api/", {}, "/tmp/data")
+        indicator_config = {
+            "watermark_field": "Date",
+            "transform": {"aliases": {"country": "SpatialDim"}},
+            "staging_schema": {
+                "table_name": "test",
+                "columns": [
+                    ("id", "SERIAL PRIMARY KEY"),
+                    ("numericvalue", "FLOAT"),
+                    ("country", "VARCHAR(3)"),
+                    ("transformed_epoch", "BIGINT"),
+                ],
+            },
+        }
+
+        self.assertEqual(
+            extractor.construct_select_query(indicator_config),
+            "Id,NumericValue,SpatialDim,Date",
+        )
+        self.assertIsNone(extractor.construct_select_query({}))
+
+    def test_shard_filters_splits_long_lists(self):
+        extractor = c_extract_data(
+            {}, "https://example.com/api/", {}, "/tmp/data", max_filter_values=2
+        )
+        shards = extractor.shard_filters(
+            {"SpatialDim": ["ZAF", "BWA", "NAM"], "Dim1": ["SEX_MLE"]}
+        )
+        self.assertEqual(
+            shards,
+            [
+                {"SpatialDim": ["ZAF", "BWA"], "Dim1": ["SEX_MLE"]},
+                {"SpatialDim": ["NAM"], "Dim1": ["SEX_MLE"]},
+            ],
+        )
+
+    def test_get_data_merges_shards_without_duplicates(self):
+        """
+        Test that each shard is fetched and overlapping records are landed once.
+        """
+        dataset_config = {
+            "test_indicator": {
+                "code": "TEST_001",
+                "filters": {"SpatialDim": ["ZAF", "BWA", "NAM"]},
+            }
+        }
+
+        def fake_get(url, params=None, headers=None):
+            if params["$skip"]:
+                return mock_response({"value": []})
+            if "NAM" in params["$filter"]:
+                return mock_response({"value": [{"Id": 2}, {"Id": 3}]})
+            return mock_response({"value": [{"Id": 1}, {"Id": 2}]})
+
+        mock_client = MagicMock()
+        mock_client.get.side_effect = fake_get
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                http_client=mock_client,
+                max_filter_values=2,
+            )
+            output_file = extractor.get_data("test_indicator")
+
+            with open(output_file) as f:
+                ids = sorted(record["Id"] for record in json.load(f)["value"])
+
+        # One page and the empty page that ends it, per shard
+        self.assertEqual(mock_client.get.call_count, 4)
+        self.assertEqual(ids, [1, 2, 3])
+
+    def test_get_data_writes_compressed_ndjson(self):
+        dataset_config = {"test_indicator": {"code": "TEST_001", "filters": {}}}
+        mock_client = MagicMock()
+        mock_client.get.side_effect = first_page_only({"value": [{"Id": 1}, {"Id": 2}]})
+        with tempfile.TemporaryDirectory() as output_dir:
+            extractor = c_extract_data(
+                dataset_config,
+                "https://example.com/api/",
+                {},
+                output_dir,
+                http_client=mock_client,
+                landing_format="ndjson.gz",
+            )
+            output_file = extractor.get_data("test_indicator")
+
+            self.assertTrue(output_file.endswith(".ndjson.gz"))
+            with gzip.open(output_file, "rt") as f:
+                self.assertEqual(f.read(), '{"Id":1}\n{"Id":2}\n')
+
+    def test_build_requests_uses_catalog(self):
+        """
+        Test that a missing code is resolved by name and unknown filter values pruned.
+        """
+        catalog = MagicMock()
+        catalog.resolve_indicator_code.return_value = "WHOSIS_000001"
+        catalog.prune_filters.return_value = (
+            {"SpatialDim": ["ZAF"]},
+            {"SpatialDim": ["XXX"]},
+        )
+        dataset_config = {
+            "test_indicator": {
+                "name": "Life expectancy at birth (years)",
+                "filters": {"SpatialDim": ["ZAF", "XXX"]},
+            }
+        }
+        extractor = c_extract_data(
+            dataset_config, "https://example.com/api/", {}, "/tmp/data", catalog=catalog
+        )
+
+        [(url, params)] = extractor.build_requests("test_indicator")
+
+        self.assertEqual(url, "https://example.com/api/WHOSIS_000001")
+        self.assertEqual(params["$filter"], "SpatialDim eq 'ZAF'")
 
 
 if __name__ == "__main__":
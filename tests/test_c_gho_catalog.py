@@ -0,0 +1,84 @@
+from src.elt_integrations_project.extract.c_gho_catalog import c_gho_catalog
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+
+def mock_response(values):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"value": values}
+    return response
+
+
+def fake_get(url, params=None, headers=None):
+    if url.endswith("Indicator"):
+        return mock_response(
+            [
+                {
+                    "IndicatorCode": "WHOSIS_000001",
+                    "IndicatorName": "Life expectancy at birth (years)",
+                }
+            ]
+        )
+    if "DIMENSION/COUNTRY" in url:
+        return mock_response([{"Code": "ZAF"}, {"Code": "BWA"}])
+    return mock_response([{"Code": "SEX_MLE"}, {"Code": "SEX_FMLE"}])
+
+
+class TestCGhoCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, "catalog.json")
+        self.http_client = MagicMock()
+        self.http_client.get.side_effect = fake_get
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_catalog(self):
+        return c_gho_catalog(
+            "https://example.com/api/",
+            http_client=self.http_client,
+            cache_file=self.cache_file,
+            filter_dimensions={"SpatialDim": ["COUNTRY"], "Dim1": ["SEX"]},
+        )
+
+    def test_resolve_indicator_code_by_name_or_code(self):
+        catalog = self.create_catalog()
+        self.assertEqual(
+            catalog.resolve_indicator_code("life expectancy at birth (years)"),
+            "WHOSIS_000001",
+        )
+        self.assertEqual(
+            catalog.resolve_indicator_code("WHOSIS_000001"), "WHOSIS_000001"
+        )
+        with self.assertRaises(ValueError):
+            catalog.resolve_indicator_code("Unknown indicator")
+
+    def test_prune_filters_drops_unknown_values(self):
+        filters, dropped = self.create_catalog().prune_filters(
+            {"SpatialDim": ["ZAF", "XXX"], "Dim1": ["SEX_MLE"], "TimeDim": 2000}
+        )
+        self.assertEqual(
+            filters, {"SpatialDim": ["ZAF"], "Dim1": ["SEX_MLE"], "TimeDim": 2000}
+        )
+        self.assertEqual(dropped, {"SpatialDim": ["XXX"]})
+
+    def test_disk_cache_avoids_round_trip(self):
+        """
+        Test that a second catalog (a new run) reads metadata from the disk cache.
+        """
+        self.create_catalog().get_indicators()
+        self.create_catalog().get_indicators()
+        self.assertEqual(self.http_client.get.call_count, 1)
+
+        expired = self.create_catalog()
+        expired.ttl_seconds = -1
+        expired.get_indicators()
+        self.assertEqual(self.http_client.get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from src.elt_integrations_project.extract.c_http_client import c_http_client
+import requests
+import unittest
+from unittest.mock import patch, MagicMock
+
+
+def mock_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestCHttpClient(unittest.TestCase):
+    def test_session_negotiates_compression_and_keep_alive(self):
+        client = c_http_client()
+        self.assertEqual(client.session.headers["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(client.session.headers["Connection"], "keep-alive")
+
+    @patch("time.sleep")
+    def test_get_retries_transient_errors(self, mock_sleep):
+        """
+        Test that 503s and connection errors are retried until a response succeeds.
+        """
+        client = c_http_client(max_retries=3)
+        client.session.get = MagicMock(
+            side_effect=[
+                mock_response(503),
+                requests.ConnectionError("reset"),
+                mock_response(200),
+            ]
+        )
+
+        response = client.get("https://example.com/api/X")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.session.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("time.sleep")
+    def test_get_honours_retry_after_and_gives_up(self, mock_sleep):
+        """
+        Test that Retry-After is used and the last response returned after max_retries.
+        """
+        client = c_http_client(max_retries=1)
+        client.session.get = MagicMock(
+            return_value=mock_response(429, {"Retry-After": "2"})
+        )
+
+        response = client.get("https://example.com/api/X")
+
+        self.assertEqual(response.status_code, 429)
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_get_does_not_retry_client_errors(self):
+        client = c_http_client()
+        client.session.get = MagicMock(return_value=mock_response(404))
+
+        self.assertEqual(client.get("https://example.com/api/X").status_code, 404)
+        self.assertEqual(client.session.get.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
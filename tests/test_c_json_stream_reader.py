@@ -0,0 +1,60 @@
+from src.elt_integrations_project.transform.c_json_stream_reader import (
+    c_json_stream_reader,
+)
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestCJsonStreamReader(unittest.TestCase):
+    def write_document(self, directory, document, indent=None):
+        file_path = os.path.join(directory, "landing.json")
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=indent, ensure_ascii=False)
+        return file_path
+
+    def test_batches_match_document_for_any_chunk_size(self):
+        """
+        Test that records split across chunk boundaries, other top-level members
+        and strings holding JSON punctuation are all handled.
+        """
+        records = [
+            {"Id": i, "Value": str(i) + ' "quoted" ]}, ü', "NumericValue": i * 1.5}
+            for i in range(50)
+        ]
+        document = {
+            "@odata.context": "https://ghoapi.azureedge.net/api/$metadata",
+            "value": records,
+            "@odata.count": 1234567,
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for indent in (None, 2):
+                file_path = self.write_document(directory, document, indent)
+                for chunk_size in (1, 16, 1 << 20):
+                    reader = c_json_stream_reader(file_path, chunk_size=chunk_size)
+                    batches = list(reader.iter_batches(batch_size=20))
+
+                    self.assertEqual([len(batch) for batch in batches], [20, 20, 10])
+                    self.assertEqual(sum(batches, []), records)
+
+    def test_empty_or_missing_array_yields_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for document in ({"value": []}, {"@odata.context": "x"}, {}):
+                file_path = self.write_document(directory, document)
+                self.assertEqual(
+                    list(c_json_stream_reader(file_path).iter_batches()), []
+                )
+
+    def test_truncated_document_raises(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "landing.json")
+            with open(file_path, "w") as f:
+                f.write('{"value": [{"Id": 1}, {"Id": ')
+
+            with self.assertRaises(ValueError):
+                list(c_json_stream_reader(file_path, chunk_size=8).iter_records())
+
+
+if __name__ == "__main__":
+    unittest.main()
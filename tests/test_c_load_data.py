@@ -1,5 +1,11 @@
 from src.etl_integrations_project_lydon.load.c_load_data import c_load_data
+from datetime import datetime
+import json
+import os
+import polars as pl
+import tempfile
 import unittest
+from unittest.mock import patch, MagicMock
 
 
 class TestCLoadData(unittest.TestCase):
@@ -13,6 +19,146 @@ class TestCLoadData(unittest.TestCase):
         except Exception as e:
             self.fail(f"Initialization failed with error: {str(e)}")
 
+    def test_read_staging_file_reads_parquet_and_legacy_json(self):
+        loader = c_load_data()
+        rows = [{"id": 1, "country": "ZAF", "numericvalue": 60.1}]
+        with tempfile.TemporaryDirectory() as staging_dir:
+            parquet_path = os.path.join(staging_dir, "1603.parquet")
+            pl.DataFrame(rows).write_parquet(parquet_path)
+            json_path = os.path.join(staging_dir, "1604.json")
+            with open(json_path, "w") as f:
+                json.dump(rows, f)
+
+            from_parquet = loader.read_staging_file(parquet_path)
+            from_json = loader.read_staging_file(json_path)
+
+        self.assertEqual(from_parquet.to_dicts(), rows)
+        self.assertEqual(from_json.to_dicts(), rows)
+
+    @patch("psycopg2.connect")
+    def test_insert_data_to_psql_inserts_and_updates_rows(self, mock_connect):
+        cursor = MagicMock()
+        # Row 1 is new, row 2 already exists
+        cursor.fetchone.side_effect = [(0,), (1,)]
+        cursor.rowcount = 1
+        mock_connect.return_value.cursor.return_value = cursor
+
+        loader = c_load_data()
+        data = pl.DataFrame(
+            {
+                "id": [1, 2],
+                "country": ["ZAF", "BWA"],
+                "date": [datetime(2024, 8, 22, 10, 44), datetime(2024, 8, 23)],
+            }
+        )
+        stats = loader.insert_data_to_psql(data, "life_expectancy_at_birth")
+
+        self.assertEqual(stats, {"skipped": 0, "inserted": 1, "updated": 1})
+        # Timestamps are bound as datetime objects, not pre-formatted strings
+        cursor.execute.assert_any_call(
+            "INSERT INTO life_expectancy_at_birth (id, country, date) VALUES (%s, %s, %s)",
+            (1, "ZAF", datetime(2024, 8, 22, 10, 44)),
+        )
+        mock_connect.return_value.commit.assert_called_once()
+
+    @patch("psycopg2.connect")
+    def test_copy_data_to_psql_merges_batches_through_temp_table(self, mock_connect):
+        cursor = MagicMock()
+        # Per batch: (inserted, updated) reported by the merge
+        cursor.fetchone.side_effect = [(1, 0), (0, 0)]
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(
+            buffer.read().decode()
+        )
+        mock_connect.return_value.cursor.return_value = cursor
+
+        loader = c_load_data()
+        loader.copy_batch_rows = 2
+        data = pl.DataFrame(
+            {
+                "id": [1, 2, 3, 3],
+                "country": ["ZAF", "", None, None],
+                "date": [datetime(2024, 8, 22, 10, 44), None, None, None],
+            }
+        )
+        stats = loader.copy_data_to_psql(data, "life_expectancy_at_birth")
+
+        # Row 2 and 3 were unchanged; the duplicate of row 3 is skipped
+        self.assertEqual(stats, {"skipped": 3, "inserted": 1, "updated": 0})
+        executed = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertEqual(
+            executed[0],
+            "CREATE TEMP TABLE load_life_expectancy_at_birth "
+            "(LIKE life_expectancy_at_birth) ON COMMIT DROP",
+        )
+        self.assertIn(
+            "COPY load_life_expectancy_at_birth (id, country, date) FROM STDIN",
+            cursor.copy_expert.call_args[0][0],
+        )
+        self.assertEqual(
+            copied,
+            [
+                'id,country,date\n1,ZAF,2024-08-22T10:44:00.000000\n2,"",\n',
+                "id,country,date\n3,,\n",
+            ],
+        )
+        mock_connect.return_value.commit.assert_called_once()
+
+    def test_build_merge_sql_skips_unchanged_rows(self):
+        loader = c_load_data()
+        sql = loader.build_merge_sql(
+            "life_expectancy_at_birth",
+            ["id", "numericvalue", "transformed_epoch"],
+            "load_life_expectancy_at_birth",
+        )
+
+        self.assertIn("ON CONFLICT (id) DO UPDATE", sql)
+        self.assertIn(
+            "SET (numericvalue, transformed_epoch) = "
+            "ROW(EXCLUDED.numericvalue, EXCLUDED.transformed_epoch)",
+            sql,
+        )
+        # transformed_epoch alone does not make a row changed
+        self.assertIn(
+            "WHERE ROW(life_expectancy_at_birth.numericvalue) "
+            "IS DISTINCT FROM ROW(EXCLUDED.numericvalue)",
+            sql,
+        )
+        self.assertIn("RETURNING (xmax = 0) AS inserted", sql)
+
+    def test_build_merge_sql_upserts_on_natural_key_and_row_hash(self):
+        loader = c_load_data()
+        columns = ["id", "indicatorcode", "spatialdim", "timedim", "dim1"]
+        columns += ["numericvalue", "row_hash"]
+        conflict_columns = loader.get_conflict_columns(
+            "life_expectancy_at_birth", columns
+        )
+        sql = loader.build_merge_sql(
+            "life_expectancy_at_birth",
+            columns,
+            "load_life_expectancy_at_birth",
+            conflict_columns,
+        )
+
+        self.assertIn(
+            "ON CONFLICT (indicatorcode, spatialdim, timedim, dim1) DO UPDATE", sql
+        )
+        # Neither the key nor the surrogate id is rewritten
+        self.assertIn(
+            "SET (numericvalue, row_hash) = "
+            "ROW(EXCLUDED.numericvalue, EXCLUDED.row_hash)",
+            sql,
+        )
+        self.assertIn(
+            "WHERE life_expectancy_at_birth.row_hash "
+            "IS DISTINCT FROM EXCLUDED.row_hash",
+            sql,
+        )
+        # Files without the key columns still upsert on id
+        self.assertEqual(
+            loader.get_conflict_columns("life_expectancy_at_birth", ["id"]), ["id"]
+        )
+
     # There should be unit tests for each function in the class.
 
 
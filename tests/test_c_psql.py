@@ -3,6 +3,8 @@ import psycopg2
 from psycopg2 import OperationalError
 from colorama import Fore, init
 import unittest
+from unittest.mock import MagicMock
+from src.elt_integrations_project.database.c_psql import c_psql
 
 init(autoreset=True)
 
@@ -85,6 +87,35 @@ class PostgresTester(unittest.TestCase):
         else:
             print(Fore.RED + "No data retrieved from the table.")
 
+class NaturalKeyIndexTester(unittest.TestCase):
+    def setUp(self):
+        # Skips __init__, which connects to the server
+        self.psql = c_psql.__new__(c_psql)
+        self.psql.log_data = []
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        self.cursor.rowcount = 0
+
+    def test_duplicates_are_removed_before_creating_the_index(self):
+        self.psql.create_natural_key_index("life_expectancy_at_birth", self.conn)
+
+        executed = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertIn("DELETE FROM life_expectancy_at_birth AS older", executed[0])
+        self.assertIn("older.id < newer.id", executed[0])
+        self.assertIn(
+            "CREATE UNIQUE INDEX IF NOT EXISTS life_expectancy_at_birth_natural_key_idx "
+            "ON life_expectancy_at_birth (indicatorcode, spatialdim, timedim, dim1)",
+            executed[1],
+        )
+        self.conn.commit.assert_called_once()
+
+    def test_index_failure_is_raised(self):
+        self.cursor.execute.side_effect = [None, psycopg2.Error("duplicate key")]
+
+        with self.assertRaises(psycopg2.Error):
+            self.psql.create_natural_key_index("life_expectancy_at_birth", self.conn)
+        self.conn.rollback.assert_called_once()
+
 # Run the tests
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+from src.elt_integrations_project.extract.c_rate_limiter import c_rate_limiter
+from src.elt_integrations_project.extract.c_http_client import c_http_client
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+
+class TestCRateLimiter(unittest.TestCase):
+    @patch("time.time", return_value=1000.0)
+    def test_burst_then_wait_for_refill(self, mock_time):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_file = os.path.join(state_dir, "bucket.json")
+            limiter = c_rate_limiter(state_file, requests_per_second=2, burst=3)
+
+            self.assertEqual([limiter.try_acquire() for _ in range(3)], [0, 0, 0])
+            self.assertAlmostEqual(limiter.try_acquire(), 0.5)
+
+            # A second process sharing the file sees the same empty bucket
+            other = c_rate_limiter(state_file, requests_per_second=2, burst=3)
+            self.assertAlmostEqual(other.try_acquire(), 0.5)
+
+            mock_time.return_value = 1000.5
+            self.assertEqual(other.try_acquire(), 0)
+
+    @patch("time.time", return_value=1000.0)
+    def test_pause_blocks_every_limiter(self, mock_time):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_file = os.path.join(state_dir, "bucket.json")
+            c_rate_limiter(state_file).pause(5)
+
+            self.assertAlmostEqual(c_rate_limiter(state_file).try_acquire(), 5)
+
+            mock_time.return_value = 1005.1
+            self.assertEqual(c_rate_limiter(state_file).try_acquire(), 0)
+
+    @patch("time.sleep")
+    def test_http_client_acquires_per_attempt_and_pauses_on_429(self, mock_sleep):
+        limiter = MagicMock()
+        client = c_http_client(max_retries=2, rate_limiter=limiter)
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "3"})
+        client.session.get = MagicMock(
+            side_effect=[throttled, MagicMock(status_code=200, headers={})]
+        )
+
+        response = client.get("https://example.com/api/X")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.pause.assert_called_once_with(3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
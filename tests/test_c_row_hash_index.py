@@ -0,0 +1,78 @@
+from src.elt_integrations_project.transform.c_row_hash_index import c_row_hash_index
+import os
+import polars as pl
+import tempfile
+import unittest
+
+
+class TestCRowHashIndex(unittest.TestCase):
+    def test_only_new_or_changed_rows_pass_after_commit(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            index = c_row_hash_index(os.path.join(state_dir, "dataset.parquet"))
+            snapshot = pl.DataFrame(
+                {
+                    "id": [1, 2],
+                    "numericvalue": [60.1, 61.2],
+                    "transformed_epoch": [100, 100],
+                }
+            )
+
+            changed, changed_hashes = index.filter_changed(snapshot)
+            self.assertEqual(changed.height, 2)
+            self.assertNotIn("row_hash", changed.columns)
+            index.commit(changed_hashes)
+
+            # Same rows in a later run (only the epoch moved), one edit, one new row
+            next_snapshot = pl.DataFrame(
+                {
+                    "id": [1, 2, 3],
+                    "numericvalue": [60.1, 99.9, 62.3],
+                    "transformed_epoch": [200, 200, 200],
+                }
+            )
+            changed, changed_hashes = index.filter_changed(next_snapshot)
+            self.assertEqual(sorted(changed["id"].to_list()), [2, 3])
+            index.commit(changed_hashes)
+
+            self.assertEqual(index.read_index().height, 3)
+            self.assertTrue(index.filter_changed(next_snapshot)[0].is_empty())
+
+    def test_filter_changed_can_keep_row_hash(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            index = c_row_hash_index(os.path.join(state_dir, "dataset.parquet"))
+            data = pl.DataFrame({"id": [1, 2], "numericvalue": [60.1, 61.2]})
+
+            changed, changed_hashes = index.filter_changed(data, keep_hash=True)
+
+            self.assertEqual(
+                changed["row_hash"].to_list(), changed_hashes["row_hash"].to_list()
+            )
+
+    def test_hash_ignores_inferred_dtypes(self):
+        index = c_row_hash_index("unused.parquet", column_dtypes={"timedim": pl.Int64})
+        all_null = pl.DataFrame(
+            {"id": [1], "timedim": [2000], "comments": [None]},
+            schema={"id": pl.Int64, "timedim": pl.Int32, "comments": pl.Null},
+        )
+        typed = pl.DataFrame(
+            {"id": [1], "timedim": [2000], "comments": [None]},
+            schema={"id": pl.Int64, "timedim": pl.Int64, "comments": pl.String},
+        )
+
+        self.assertEqual(
+            index.add_row_hashes(all_null)["row_hash"].to_list(),
+            index.add_row_hashes(typed)["row_hash"].to_list(),
+        )
+
+    def test_hash_ignores_column_order(self):
+        index = c_row_hash_index("unused.parquet")
+        data = pl.DataFrame({"id": [1], "country": ["ZAF"], "timedim": [2000]})
+
+        hashes = index.add_row_hashes(data)["row_hash"]
+        reordered = index.add_row_hashes(data.select("timedim", "id", "country"))
+
+        self.assertEqual(hashes.to_list(), reordered["row_hash"].to_list())
+
+
+if __name__ == "__main__":
+    unittest.main()
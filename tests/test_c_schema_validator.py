@@ -0,0 +1,118 @@
+from src.elt_integrations_project.transform.c_schema_validator import (
+    c_schema_validator,
+    parse_column_type,
+)
+import polars as pl
+import unittest
+
+STAGING_SCHEMA = {
+    "table_name": "life_expectancy_at_birth",
+    "columns": [
+        ("id", "SERIAL PRIMARY KEY"),
+        ("spatialdim", "VARCHAR(3)"),
+        ("timedim", "INTEGER"),
+        ("numericvalue", "FLOAT"),
+        ("date", "TIMESTAMP"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+}
+
+
+class TestCSchemaValidator(unittest.TestCase):
+    def test_parse_column_type(self):
+        self.assertEqual(
+            parse_column_type("VARCHAR(3)"),
+            {
+                "base_type": "VARCHAR",
+                "dtype": pl.String,
+                "max_length": 3,
+                "required": False,
+            },
+        )
+        self.assertTrue(parse_column_type("SERIAL PRIMARY KEY")["required"])
+        self.assertEqual(parse_column_type("DOUBLE PRECISION")["dtype"], pl.Float64)
+
+    def test_split_quarantines_failing_rows_with_reasons(self):
+        data = pl.DataFrame(
+            {
+                "id": [1, None, 3, 4],
+                "spatialdim": ["ZAF", "BWA", "ZAFX", "NAM"],
+                "timedim": [2000, 2001, 2002, 3_000_000_000],
+                "numericvalue": ["60.1", "61.0", "n/a", "62.0"],
+                "date": ["2024-01-01T00:00:00", None, "2024-01-03T00:00:00", "x"],
+            }
+        )
+
+        valid, quarantined = c_schema_validator(STAGING_SCHEMA).split(data)
+
+        self.assertEqual(valid["id"].to_list(), [1])
+        self.assertNotIn("quarantine_reason", valid.columns)
+        reasons = quarantined["quarantine_reason"].to_list()
+        self.assertEqual(reasons[0], "id: null")
+        self.assertEqual(
+            reasons[1], "spatialdim: longer than 3; numericvalue: not FLOAT"
+        )
+        self.assertEqual(reasons[2], "timedim: not INTEGER; date: not TIMESTAMP")
+
+    def test_split_quarantines_everything_without_required_column(self):
+        data = pl.DataFrame({"spatialdim": ["ZAF"]})
+
+        valid, quarantined = c_schema_validator(STAGING_SCHEMA).split(data)
+
+        self.assertTrue(valid.is_empty())
+        self.assertEqual(quarantined["quarantine_reason"][0], "id: missing")
+
+    def test_split_quarantines_rows_with_transform_errors(self):
+        data = pl.DataFrame(
+            {
+                "id": [1, 2],
+                "timedim": [2000, None],
+                "transform_error": [None, "timedim: not Int64"],
+            }
+        )
+
+        valid, quarantined = c_schema_validator(STAGING_SCHEMA).split(data)
+
+        self.assertEqual(valid.columns, ["id", "timedim"])
+        self.assertEqual(quarantined["id"].to_list(), [2])
+        self.assertEqual(quarantined["quarantine_reason"][0], "timedim: not Int64")
+
+    def test_natural_key_columns_are_required(self):
+        schema = {**STAGING_SCHEMA, "natural_key": ["spatialdim", "timedim"]}
+        data = pl.DataFrame(
+            {"id": [1, 2], "spatialdim": ["ZAF", None], "timedim": [2000, 2000]}
+        )
+
+        valid, quarantined = c_schema_validator(schema).split(data)
+
+        self.assertEqual(valid["id"].to_list(), [1])
+        self.assertEqual(quarantined["quarantine_reason"][0], "spatialdim: null")
+
+    def test_optimize_dtypes_downcasts_and_encodes_low_cardinality(self):
+        data = pl.DataFrame(
+            {
+                "id": list(range(6)),
+                "spatialdim": ["ZAF", "ZAF", "BWA", "BWA", "NAM", "NAM"],
+                "timedim": [2000, 2001, 2002, 2003, 2004, 2005],
+                "numericvalue": [60.1, 61.2, 62.3, 63.4, 64.5, 65.6],
+                "comments": ["a", "b", "c", "d", "e", "f"],
+            }
+        )
+        schema = dict(STAGING_SCHEMA)
+        schema["columns"] = STAGING_SCHEMA["columns"] + [("comments", "TEXT")]
+
+        optimized = c_schema_validator(schema).optimize_dtypes(data)
+
+        self.assertEqual(optimized.schema["id"], pl.Int32)
+        self.assertEqual(optimized.schema["timedim"], pl.Int32)
+        self.assertEqual(optimized.schema["numericvalue"], pl.Float64)
+        self.assertEqual(optimized.schema["spatialdim"], pl.Categorical)
+        # Every value distinct: dictionary encoding would not pay off
+        self.assertEqual(optimized.schema["comments"], pl.String)
+        self.assertEqual(
+            optimized["spatialdim"].to_list(), data["spatialdim"].to_list()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
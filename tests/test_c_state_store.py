@@ -0,0 +1,28 @@
+from src.elt_integrations_project.extract.c_state_store import c_state_store
+import os
+import tempfile
+import unittest
+
+
+class TestCStateStore(unittest.TestCase):
+    def test_update_merges_fields_per_indicator(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_file = os.path.join(state_dir, "state.json")
+            store = c_state_store(state_file)
+
+            self.assertEqual(store.get("indicator_a"), {})
+
+            store.update("indicator_a", watermark="2024-01-01T00:00:00+00:00")
+            store.update("indicator_b", watermark=2000)
+            store.update("indicator_a", etag='W/"1"')
+
+            reopened = c_state_store(state_file)
+            self.assertEqual(
+                reopened.get("indicator_a"),
+                {"watermark": "2024-01-01T00:00:00+00:00", "etag": 'W/"1"'},
+            )
+            self.assertEqual(reopened.get("indicator_b"), {"watermark": 2000})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,60 @@
 from src.etl_integrations_project_lydon.transform.c_transform_data import (
     c_transform_data,
 )
+from datetime import datetime
+import gzip
+import json
+import os
+import polars as pl
+import tempfile
 import unittest
 
 
+def sample_records():
+    return [
+        {
+            "Id": 1,
+            "IndicatorCode": "WHOSIS_000001",
+            "SpatialDim": "ZAF",
+            "Dim1": "SEX_MLE",
+            "NumericValue": 60.1,
+            "TimeDim": 2000,
+            "Date": "2024-08-22T12:44:58.687+02:00",
+            "TimeDimensionBegin": "2000-01-01T00:00:00+00:00",
+            "TimeDimensionEnd": "2000-12-31T00:00:00+00:00",
+            "Value": "60.1",
+        }
+    ]
+
+
 class TestCTransformData(unittest.TestCase):
+    def setUp(self):
+        # One temporary directory holds everything a transformer writes
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_transformer(self):
+        transformer = c_transform_data()
+        transformer.landing_dir = os.path.join(self.data_dir, "landing")
+        transformer.staging_dir = os.path.join(self.data_dir, "staging")
+        transformer.quarantine_dir = os.path.join(self.data_dir, "quarantine")
+        transformer.log_dir = os.path.join(self.data_dir, "logs")
+        transformer.row_hash_dir = os.path.join(self.data_dir, "row_hashes")
+        transformer.spool_dir = os.path.join(self.data_dir, "spool")
+        transformer.aggregator.metrics_dir = os.path.join(self.data_dir, "metrics")
+        return transformer
+
+    def read_only_file(self, base_dir):
+        (file_path,) = [
+            os.path.join(root, file)
+            for root, _, files in os.walk(base_dir)
+            for file in files
+        ]
+        return pl.read_parquet(file_path)
+
     def test_initialization(self):
         """
         Test if the c_transform_data class can be instantiated without raising any errors or returning null.
@@ -15,7 +65,353 @@ class TestCTransformData(unittest.TestCase):
         except Exception as e:
             self.fail(f"Initialization failed with error: {str(e)}")
 
-    # There should be unit tests for each function in the class.
+    def test_transform_data_applies_column_aliases(self):
+        """
+        Test that the dataset's transform aliases are copied and source columns kept.
+        """
+        transformer = c_transform_data()
+        transformer.data = pl.LazyFrame(sample_records())
+
+        data = transformer.transform_data("life_expectancy_at_birth").collect()
+
+        row = data.row(0, named=True)
+        self.assertEqual(row["country"], "ZAF")
+        self.assertEqual(row["spatialdim"], "ZAF")
+        self.assertEqual(row["sex"], "SEX_MLE")
+        self.assertNotIn("value", data.columns)
+
+        # Datetimes stay typed, normalized to naive UTC
+        self.assertEqual(data.schema["date"], pl.Datetime("us"))
+        self.assertEqual(row["date"], datetime(2024, 8, 22, 10, 44, 58, 687000))
+        self.assertEqual(row["timedimensionbegin"], datetime(2000, 1, 1))
+
+    def test_transform_spec_is_compiled_once_and_skips_missing_columns(self):
+        """
+        Test that a config-only transform spec drives the transform, is compiled
+        once per dataset, and ignores steps whose source column is absent.
+        """
+        transformer = c_transform_data()
+        transformer.dataset_config = {
+            "other_indicator": {
+                "transform": {
+                    "aliases": {"region": "SpatialDim"},
+                    "casts": {"TimeDim": "Int32", "Missing": "Float64"},
+                    "drop": ["Value"],
+                }
+            }
+        }
+        transformer.data = pl.LazyFrame(sample_records())
+
+        data = transformer.transform_data("other_indicator").collect()
+        spec = transformer.get_transform_spec("other_indicator")
+
+        self.assertIs(spec, transformer.transform_specs["other_indicator"])
+        self.assertEqual(data["region"][0], "ZAF")
+        self.assertEqual(data.schema["timedim"], pl.Int32)
+        self.assertNotIn("value", data.columns)
+        self.assertNotIn("missing", data.columns)
+
+    def test_get_data_file_reads_compressed_ndjson(self):
+        transformer = self.create_transformer()
+        file_path = os.path.join(self.data_dir, "1319.ndjson.gz")
+        with gzip.open(file_path, "wt") as f:
+            for record in sample_records():
+                f.write(json.dumps(record) + "\n")
+
+        data = transformer.get_data_file(file_path)
+        self.assertIsInstance(data, pl.LazyFrame)
+        data = data.collect()
+
+        self.assertEqual(data.height, 1)
+        self.assertEqual(data["SpatialDim"][0], "ZAF")
+
+    def test_get_data_file_streams_json_document_through_spool(self):
+        """
+        Test that a JSON landing document is streamed into an NDJSON spool that
+        is scanned lazily and removed afterwards.
+        """
+        transformer = self.create_transformer()
+        transformer.json_batch_size = 2
+        records = [dict(sample_records()[0], Id=i) for i in range(5)]
+        file_path = os.path.join(self.data_dir, "1319.json")
+        with open(file_path, "w") as f:
+            json.dump({"@odata.context": "x", "value": records}, f, indent=2)
+
+        data = transformer.get_data_file(file_path)
+        self.assertIsInstance(data, pl.LazyFrame)
+        self.assertEqual(data.collect()["Id"].to_list(), [0, 1, 2, 3, 4])
+
+        transformer.remove_spool_files()
+        self.assertEqual(os.listdir(transformer.spool_dir), [])
+
+    def test_process_dataset_batch_writes_one_staging_file(self):
+        """
+        Test that batch mode merges every landing file into one staging output,
+        keeping the newest record per Id, and removes the landing files.
+        """
+        transformer = self.create_transformer()
+
+        dataset_dir = os.path.join(transformer.landing_dir, "life_expectancy_at_birth")
+        older_path = os.path.join(dataset_dir, "20240101", "1200.json")
+        newer_path = os.path.join(dataset_dir, "20240102", "1200.ndjson.gz")
+        os.makedirs(os.path.dirname(older_path))
+        os.makedirs(os.path.dirname(newer_path))
+
+        older = sample_records() + [dict(sample_records()[0], Id=2)]
+        with open(older_path, "w") as f:
+            json.dump({"value": older}, f)
+        with gzip.open(newer_path, "wt") as f:
+            f.write(json.dumps(dict(sample_records()[0], NumericValue=61.5)) + "\n")
+
+        transformer.batch_mode = True
+        transformer.staging_format = "parquet"
+        transformer.process_all_files()
+
+        staging_files = [
+            os.path.join(root, file)
+            for root, _, files in os.walk(transformer.staging_dir)
+            for file in files
+        ]
+        self.assertEqual(len(staging_files), 1)
+        self.assertIn("20240102", staging_files[0])
+        self.assertTrue(staging_files[0].endswith(".parquet"))
+        staged = pl.read_parquet(staging_files[0])
+        rows = {row["id"]: row for row in staged.iter_rows(named=True)}
+
+        self.assertEqual(sorted(rows), [1, 2])
+        self.assertEqual(rows[1]["numericvalue"], 61.5)
+        self.assertFalse(os.path.exists(older_path))
+        self.assertFalse(os.path.exists(newer_path))
+
+    def test_batch_falls_back_to_single_files_and_quarantines_failures(self):
+        """
+        Test that a column first set after the first hundred rows does not fail
+        the batch, and that a landing file that cannot be read is quarantined
+        instead of blocking the rest of the dataset.
+        """
+        transformer = self.create_transformer()
+        transformer.batch_mode = True
+        dataset_dir = os.path.join(transformer.landing_dir, "life_expectancy_at_birth")
+        late_column_path = os.path.join(dataset_dir, "20240101", "1200.ndjson.gz")
+        broken_path = os.path.join(dataset_dir, "20240101", "1300.ndjson")
+        os.makedirs(os.path.dirname(late_column_path))
+
+        with gzip.open(late_column_path, "wt") as f:
+            for fact_id in range(1, 151):
+                record = dict(sample_records()[0], Id=fact_id, Comments=None)
+                if fact_id == 150:
+                    record["Comments"] = "Provisional"
+                f.write(json.dumps(record) + "\n")
+        with open(broken_path, "w") as f:
+            f.write('{"Id": 151, "SpatialDim": \n')
+
+        transformer.process_all_files()
+
+        staged = self.read_only_file(transformer.staging_dir)
+        self.assertEqual(staged.height, 150)
+        self.assertEqual(staged["comments"].drop_nulls().to_list(), ["Provisional"])
+        self.assertFalse(os.path.exists(late_column_path))
+        self.assertFalse(os.path.exists(broken_path))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    transformer.quarantine_dir,
+                    "life_expectancy_at_birth",
+                    "20240101",
+                    "1300.ndjson",
+                )
+            )
+        )
+
+    def test_unchanged_rows_are_not_staged_again(self):
+        """
+        Test that a second landing of identical records produces no staging file.
+        """
+        transformer = self.create_transformer()
+        transformer.change_detection = True
+
+        landing_dir = os.path.join(
+            transformer.landing_dir, "life_expectancy_at_birth", "20240101"
+        )
+        os.makedirs(landing_dir)
+        staged_counts = []
+        for hour_minute in ("1200", "1300"):
+            landing_path = os.path.join(landing_dir, f"{hour_minute}.json")
+            with open(landing_path, "w") as f:
+                json.dump({"value": sample_records()}, f)
+            transformer.process_all_files()
+            self.assertFalse(os.path.exists(landing_path))
+            staged_counts.append(
+                sum(len(files) for _, _, files in os.walk(transformer.staging_dir))
+            )
+
+        self.assertEqual(staged_counts, [1, 1])
+
+    def test_invalid_rows_are_quarantined_not_staged(self):
+        """
+        Test that rows breaking staging_schema go to the quarantine directory while
+        the valid rows are staged.
+        """
+        transformer = self.create_transformer()
+        transformer.staging_format = "parquet"
+
+        landing_path = os.path.join(
+            transformer.landing_dir,
+            "life_expectancy_at_birth",
+            "20240101",
+            "1200.json",
+        )
+        os.makedirs(os.path.dirname(landing_path))
+        records = sample_records() + [
+            dict(sample_records()[0], Id=2, SpatialDim="TOO_LONG")
+        ]
+        with open(landing_path, "w") as f:
+            json.dump({"value": records}, f)
+
+        transformer.process_all_files()
+
+        staged = self.read_only_file(transformer.staging_dir)
+        quarantined = self.read_only_file(transformer.quarantine_dir)
+
+        self.assertEqual(staged["id"].to_list(), [1])
+        self.assertEqual(quarantined["id"].to_list(), [2])
+        # The content hash travels with the row as a signed BIGINT for the loader
+        self.assertEqual(staged.schema["row_hash"], pl.Int64)
+        self.assertIn("spatialdim: longer than 3", quarantined["quarantine_reason"][0])
+
+    def test_unconvertible_values_are_quarantined_not_fatal(self):
+        """
+        Test that a TimeDim or Date the transform cannot convert quarantines its
+        row instead of failing the whole file.
+        """
+        transformer = self.create_transformer()
+        transformer.staging_format = "parquet"
+
+        landing_path = os.path.join(
+            transformer.landing_dir,
+            "life_expectancy_at_birth",
+            "20240101",
+            "1200.json",
+        )
+        os.makedirs(os.path.dirname(landing_path))
+        records = sample_records() + [
+            dict(sample_records()[0], Id=2, TimeDim="n/a"),
+            dict(sample_records()[0], Id=3, Date="yesterday"),
+        ]
+        with open(landing_path, "w") as f:
+            json.dump({"value": records}, f)
+
+        transformer.process_all_files()
+
+        self.assertFalse(os.path.exists(landing_path))
+        staged = self.read_only_file(transformer.staging_dir)
+        quarantined = self.read_only_file(transformer.quarantine_dir)
+
+        self.assertEqual(staged["id"].to_list(), [1])
+        self.assertNotIn("transform_error", staged.columns)
+        self.assertEqual(
+            quarantined["quarantine_reason"].to_list(),
+            [
+                "timedim: not Int64; timedim: null",
+                "date: not %Y-%m-%dT%H:%M:%S%.f%z",
+            ],
+        )
+
+    def test_files_staged_in_the_same_minute_keep_their_own_names(self):
+        """
+        Test that landing files staged one after the other within a minute do
+        not overwrite each other's staging file.
+        """
+        transformer = self.create_transformer()
+        transformer.staging_format = "parquet"
+        transformer.batch_mode = False
+        transformer.max_workers = 2
+
+        landing_dir = os.path.join(
+            transformer.landing_dir, "life_expectancy_at_birth", "20240101"
+        )
+        os.makedirs(landing_dir)
+        for hour_minute, ids in (("1200", range(1, 6)), ("1300", range(6, 11))):
+            records = [
+                dict(sample_records()[0], Id=fact_id, TimeDim=1999 + fact_id)
+                for fact_id in ids
+            ]
+            with open(os.path.join(landing_dir, f"{hour_minute}.json"), "w") as f:
+                json.dump({"value": records}, f)
+
+        transformer.process_all_files()
+
+        staged = pl.concat(
+            [
+                pl.read_parquet(os.path.join(root, file))
+                for root, _, files in os.walk(transformer.staging_dir)
+                for file in files
+            ],
+            how="diagonal_relaxed",
+        )
+
+        self.assertEqual(sorted(staged["id"].to_list()), list(range(1, 11)))
+
+    def test_get_work_units_keeps_files_of_a_dataset_together(self):
+        """
+        Test that files of one dataset are never split across workers, even
+        outside batch mode.
+        """
+        transformer = self.create_transformer()
+        landing_dir = os.path.join(
+            transformer.landing_dir, "life_expectancy_at_birth", "20240101"
+        )
+        os.makedirs(landing_dir)
+        for hour_minute in ("1200", "1300"):
+            with open(os.path.join(landing_dir, f"{hour_minute}.json"), "w") as f:
+                json.dump({"value": sample_records()}, f)
+
+        transformer.batch_mode = False
+        work_units = transformer.get_work_units()
+
+        self.assertEqual(len(work_units), 1)
+        dataset_name, file_paths = work_units[0]
+        self.assertEqual(dataset_name, "life_expectancy_at_birth")
+        self.assertEqual(len(file_paths), 2)
+
+    def test_process_all_files_in_worker_processes(self):
+        """
+        Test that datasets are transformed in a process pool and that the workers'
+        logs are written by the parent.
+        """
+        transformer = self.create_transformer()
+        dataset = transformer.dataset_config["life_expectancy_at_birth"]
+        transformer.dataset_config = {"dataset_a": dataset, "dataset_b": dataset}
+        for dataset_name in transformer.dataset_config:
+            landing_dir = os.path.join(
+                transformer.landing_dir, dataset_name, "20240101"
+            )
+            os.makedirs(landing_dir)
+            with open(os.path.join(landing_dir, "1200.json"), "w") as f:
+                json.dump({"value": sample_records()}, f)
+
+        transformer.batch_mode = True
+        transformer.max_workers = 2
+        transformer.process_all_files()
+
+        for dataset_name in transformer.dataset_config:
+            log_path = os.path.join(
+                transformer.log_dir,
+                "transform",
+                dataset_name,
+                "20240101",
+                "1200.json",
+            )
+            with open(log_path) as f:
+                self.assertTrue(json.load(f)["success"])
+            self.assertEqual(
+                len(
+                    os.listdir(
+                        os.path.join(transformer.staging_dir, dataset_name, "20240101")
+                    )
+                ),
+                1,
+            )
 
 
 if __name__ == "__main__":
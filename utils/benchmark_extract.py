@@ -0,0 +1,135 @@
+# utils/benchmark_extract.py
+"""
+Offline extract benchmark. Starts the GHO stand-in, then times the synchronous
+and async extractors over the same indicators, landing into a throwaway
+directory. Results are printed and saved under logs/benchmark/.
+
+    python3 utils/benchmark_extract.py [synthetic|replay]
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import time
+import statistics
+from datetime import datetime
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+from utils.gho_standin_server import GhoStandinServer  # noqa: E402
+from src.elt_integrations_project.extract.c_extract_data import (  # noqa: E402
+    c_extract_data,
+)
+from src.elt_integrations_project.extract.c_async_extract import (  # noqa: E402
+    c_async_extract,
+)
+
+# Initialize colorama
+init(autoreset=True)
+
+
+class ExtractBenchmark:
+    def __init__(self, standin_overrides=None):
+        self.config = cfg.BENCHMARK_CONFIG
+        # Port 0 lets the OS pick a free port so runs never collide
+        self.server = GhoStandinServer(dict({"port": 0}, **(standin_overrides or {})))
+        self.dataset_config = {
+            code.lower(): {"code": code, "filters": {}}
+            for code in self.config["indicator_codes"]
+        }
+
+    def create_extractor(self, output_dir):
+        return c_extract_data(
+            dataset_config=self.dataset_config,
+            base_url=self.server.base_url,
+            headers=cfg.HEADERS,
+            output_dir=output_dir,
+            page_size=self.config["page_size"],
+            max_workers=self.config["max_concurrency_per_host"],
+            landing_format=cfg.EXTRACT_CONFIG["landing_format"],
+        )
+
+    def run_sync(self, output_dir):
+        extractor = self.create_extractor(output_dir)
+        for indicator_key in self.dataset_config:
+            extractor.get_data(indicator_key)
+
+    def run_async(self, output_dir):
+        extractor = self.create_extractor(output_dir)
+        c_async_extract(
+            extractor,
+            max_concurrency_per_host=self.config["max_concurrency_per_host"],
+        ).run()
+
+    def time_runs(self, name, func):
+        durations = []
+        for _ in range(self.config["repeats"]):
+            output_dir = tempfile.mkdtemp(prefix=f"benchmark_{name}_")
+            requests_before = len(self.server.request_log)
+            start_time = time.perf_counter()
+            try:
+                func(output_dir)
+            finally:
+                durations.append(time.perf_counter() - start_time)
+                shutil.rmtree(output_dir, ignore_errors=True)
+            request_count = len(self.server.request_log) - requests_before
+
+        return {
+            "name": name,
+            "runs": len(durations),
+            "median_seconds": round(statistics.median(durations), 3),
+            "min_seconds": round(min(durations), 3),
+            "max_seconds": round(max(durations), 3),
+            "requests_per_run": request_count,
+        }
+
+    def run(self):
+        self.server.start()
+        try:
+            results = [
+                self.time_runs("sync", self.run_sync),
+                self.time_runs("async", self.run_async),
+            ]
+        finally:
+            self.server.stop()
+
+        print(
+            f"\n{Fore.CYAN}{'Engine':<10}{'Median (s)':<14}{'Min (s)':<10}{'Requests':<10}"
+        )
+        print("-" * 44)
+        for result in results:
+            print(
+                f"{result['name']:<10}{result['median_seconds']:<14}{result['min_seconds']:<10}{result['requests_per_run']:<10}"
+            )
+
+        self.save_results(results)
+        return results
+
+    def save_results(self, results):
+        current_time = datetime.now()
+        log_dir = os.path.join(
+            cfg.LOG_DIR, "benchmark", current_time.strftime("%Y%m%d")
+        )
+        os.makedirs(log_dir, exist_ok=True)
+        log_file_path = os.path.join(log_dir, f"{current_time.strftime('%H%M')}.json")
+
+        log_data = {
+            "timestamp": current_time.isoformat(),
+            "standin": {
+                key: self.server.config[key]
+                for key in ("mode", "latency_ms", "error_rate", "max_page_size")
+            },
+            "benchmark": self.config,
+            "results": results,
+        }
+        with open(log_file_path, "w") as f:
+            json.dump(log_data, f, indent=2)
+        print(f"{Fore.GREEN}Benchmark results saved to {log_file_path}")
+
+
+if __name__ == "__main__":
+    overrides = {"mode": sys.argv[1]} if len(sys.argv) > 1 else {}
+    ExtractBenchmark(overrides).run()
@@ -0,0 +1,452 @@
+# utils/gho_standin_server.py
+"""
+Local stand-in for the WHO GHO OData API, for offline and repeatable extract runs.
+
+Modes:
+- synthetic: serves deterministic generated facts for any indicator code.
+- record:    proxies to the real API and saves the returned facts as cassettes.
+- replay:    serves previously recorded cassettes only (no network).
+
+Supports $filter (eq/ne/ge/gt/le/lt joined by 'and'/'or'), $select, $top, $skip,
+$count, server-driven paging (@odata.nextLink), ETag/304, gzip and an injected
+latency and error rate. The Indicator and DIMENSION/<code>/DimensionValues
+metadata endpoints are always served from the synthetic data.
+
+Point the extractor at it with:
+    export GHO_API_URL=http://127.0.0.1:8765/api/
+"""
+
+import os
+import sys
+import gzip
+import json
+import random
+import re
+import hashlib
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+import requests
+from colorama import Fore, init
+
+sys.path.append(os.getcwd())
+from config import config as cfg  # noqa: E402
+
+# Initialize colorama
+init(autoreset=True)
+
+COMPARISON_PATTERN = re.compile(r"^(\w+)\s+(eq|ne|ge|gt|le|lt)\s+(.+)$")
+OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "ge": lambda a, b: a >= b,
+    "gt": lambda a, b: a > b,
+    "le": lambda a, b: a <= b,
+    "lt": lambda a, b: a < b,
+}
+SYNTHETIC_COUNTRIES = [
+    ("ZAF", "AFR", "Africa"),
+    ("BWA", "AFR", "Africa"),
+    ("NAM", "AFR", "Africa"),
+    ("ZWE", "AFR", "Africa"),
+    ("MOZ", "AFR", "Africa"),
+    ("LSO", "AFR", "Africa"),
+    ("KEN", "AFR", "Africa"),
+    ("NGA", "AFR", "Africa"),
+    ("DEU", "EUR", "Europe"),
+    ("FRA", "EUR", "Europe"),
+    ("GBR", "EUR", "Europe"),
+    ("JPN", "WPR", "Western Pacific"),
+    ("USA", "AMR", "Americas"),
+    ("BRA", "AMR", "Americas"),
+    ("IND", "SEAR", "South-East Asia"),
+    ("EGY", "EMR", "Eastern Mediterranean"),
+]
+SYNTHETIC_SEXES = ["SEX_MLE", "SEX_FMLE", "SEX_BTSX"]
+
+
+def split_top_level(expression, separator):
+    """
+    Splits on a keyword separator (e.g. ' and ') outside quotes and parentheses.
+    """
+    parts, depth, in_quotes, start, i = [], 0, False, 0, 0
+    while i < len(expression):
+        char = expression[i]
+        if char == "'":
+            in_quotes = not in_quotes
+        elif not in_quotes and char == "(":
+            depth += 1
+        elif not in_quotes and char == ")":
+            depth -= 1
+        elif (
+            not in_quotes
+            and depth == 0
+            and expression[i : i + len(separator)] == separator
+        ):
+            parts.append(expression[start:i])
+            start = i + len(separator)
+            i = start
+            continue
+        i += 1
+    parts.append(expression[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_literal(literal):
+    literal = literal.strip()
+    if literal.startswith("'") and literal.endswith("'"):
+        return literal[1:-1].replace("''", "'")
+    try:
+        return int(literal)
+    except ValueError:
+        pass
+    try:
+        return float(literal)
+    except ValueError:
+        pass
+    return parse_datetime(literal) or literal
+
+
+def parse_datetime(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def compile_filter(filter_query):
+    """
+    Compiles an OData $filter into a predicate over a record dict.
+    """
+    if not filter_query:
+        return lambda record: True
+
+    def compile_expression(expression):
+        expression = expression.strip()
+        or_parts = split_top_level(expression, " or ")
+        if len(or_parts) > 1:
+            predicates = [compile_expression(part) for part in or_parts]
+            return lambda record: any(p(record) for p in predicates)
+
+        and_parts = split_top_level(expression, " and ")
+        if len(and_parts) > 1:
+            predicates = [compile_expression(part) for part in and_parts]
+            return lambda record: all(p(record) for p in predicates)
+
+        if expression.startswith("(") and expression.endswith(")"):
+            return compile_expression(expression[1:-1])
+
+        match = COMPARISON_PATTERN.match(expression)
+        if not match:
+            raise ValueError(f"Unsupported $filter clause: {expression}")
+        field, operator, literal = match.groups()
+        expected = parse_literal(literal)
+        compare = OPERATORS[operator]
+
+        def predicate(record):
+            actual = record.get(field)
+            if actual is None:
+                return False
+            if isinstance(expected, datetime):
+                actual = parse_datetime(actual)
+                if actual is None:
+                    return False
+            try:
+                return compare(actual, expected)
+            except TypeError:
+                return False
+
+        return predicate
+
+    return compile_expression(filter_query)
+
+
+def generate_synthetic_facts(indicator_code, years=range(2000, 2022)):
+    """
+    Deterministic GHO-shaped facts for an indicator: every synthetic country,
+    sex and year. The same code always produces the same rows.
+    """
+    rng = random.Random(indicator_code)
+    facts = []
+    # A per-code base plus a counter; the largest Id (65535 * 10000 + 1056)
+    # stays within the INTEGER/SERIAL id column of the staging schema
+    fact_id = int(hashlib.sha1(indicator_code.encode()).hexdigest()[:4], 16) * 10000
+    for country, region_code, region in SYNTHETIC_COUNTRIES:
+        base = rng.uniform(45, 80)
+        for sex in SYNTHETIC_SEXES:
+            for year in years:
+                value = round(base + (year - 2000) * rng.uniform(0.05, 0.4), 2)
+                fact_id += 1
+                facts.append(
+                    {
+                        "Id": fact_id,
+                        "IndicatorCode": indicator_code,
+                        "SpatialDimType": "COUNTRY",
+                        "SpatialDim": country,
+                        "ParentLocationCode": region_code,
+                        "TimeDimType": "YEAR",
+                        "ParentLocation": region,
+                        "Dim1Type": "SEX",
+                        "Dim1": sex,
+                        "TimeDim": year,
+                        "Dim2Type": None,
+                        "Dim2": None,
+                        "Dim3Type": None,
+                        "Dim3": None,
+                        "DataSourceDimType": None,
+                        "DataSourceDim": None,
+                        "Value": f"{value:.1f}",
+                        "NumericValue": value,
+                        "Low": None,
+                        "High": None,
+                        "Comments": None,
+                        "Date": f"2024-0{1 + year % 9}-15T10:00:00.000+02:00",
+                        "TimeDimensionValue": str(year),
+                        "TimeDimensionBegin": f"{year}-01-01T00:00:00+02:00",
+                        "TimeDimensionEnd": f"{year}-12-31T00:00:00+02:00",
+                    }
+                )
+    return facts
+
+
+def generate_synthetic_metadata(path_parts):
+    """
+    Returns the metadata list for /api/Indicator or
+    /api/DIMENSION/<code>/DimensionValues, or None for other paths.
+    """
+    if path_parts == ["Indicator"]:
+        return [
+            {
+                "IndicatorCode": code,
+                "IndicatorName": name,
+                "Language": "EN",
+            }
+            for code, name in [
+                ("WHOSIS_000001", "Life expectancy at birth (years)"),
+                ("WHOSIS_000002", "Healthy life expectancy (HALE) at birth (years)"),
+                ("WHOSIS_000015", "Life expectancy at age 60 (years)"),
+            ]
+        ]
+
+    if len(path_parts) == 3 and path_parts[0] == "DIMENSION":
+        dimension = path_parts[1]
+        if dimension == "COUNTRY":
+            codes = [country for country, _, _ in SYNTHETIC_COUNTRIES]
+        elif dimension == "REGION":
+            codes = sorted({region for _, region, _ in SYNTHETIC_COUNTRIES})
+        elif dimension == "SEX":
+            codes = SYNTHETIC_SEXES
+        else:
+            codes = []
+        return [{"Code": code, "Title": code, "Dimension": dimension} for code in codes]
+
+    return None
+
+
+class GhoStandinServer:
+    def __init__(self, config=None):
+        self.config = dict(cfg.STANDIN_CONFIG, **(config or {}))
+        self.mode = self.config["mode"]
+        self.cassette_dir = self.config["cassette_dir"]
+        self.facts_cache = {}
+        self.facts_lock = threading.Lock()
+        self.request_log = []
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def cassette_path(self, indicator_code):
+        return os.path.join(self.cassette_dir, f"{indicator_code}.ndjson.gz")
+
+    def load_cassette(self, indicator_code):
+        path = self.cassette_path(indicator_code)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def save_cassette(self, indicator_code, facts):
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        with gzip.open(self.cassette_path(indicator_code), "wt", encoding="utf-8") as f:
+            for fact in facts:
+                f.write(json.dumps(fact, separators=(",", ":")) + "\n")
+
+    def record_from_upstream(self, indicator_code, filter_query):
+        """
+        Fetches the facts matching the request from the real API (following its
+        paging) and merges them into the indicator's cassette by Id.
+        """
+        url = f"{self.config['upstream_url']}{indicator_code}"
+        params = {"$filter": filter_query} if filter_query else None
+        fetched = []
+        while url:
+            response = requests.get(url, params=params, timeout=60)
+            response.raise_for_status()
+            payload = response.json()
+            fetched.extend(payload.get("value", []))
+            url, params = payload.get("@odata.nextLink"), None
+
+        merged = {fact["Id"]: fact for fact in self.load_cassette(indicator_code) or []}
+        merged.update({fact["Id"]: fact for fact in fetched})
+        facts = sorted(merged.values(), key=lambda fact: fact["Id"])
+        self.save_cassette(indicator_code, facts)
+        print(f"{Fore.CYAN}Recorded {len(fetched)} facts for {indicator_code}")
+        return facts
+
+    def get_facts(self, indicator_code, filter_query):
+        with self.facts_lock:
+            if self.mode == "record":
+                facts = self.record_from_upstream(indicator_code, filter_query)
+            elif indicator_code in self.facts_cache:
+                facts = self.facts_cache[indicator_code]
+            elif self.mode == "replay":
+                facts = self.load_cassette(indicator_code)
+            else:
+                facts = generate_synthetic_facts(indicator_code)
+            if facts is not None:
+                self.facts_cache[indicator_code] = facts
+            return facts
+
+    def handle_query(self, indicator_code, query):
+        """
+        Returns (status, payload) for an OData query against one indicator.
+        """
+        filter_query = query.get("$filter", "")
+        facts = self.get_facts(indicator_code, filter_query)
+        if facts is None:
+            return 404, {"error": f"No cassette recorded for {indicator_code}"}
+
+        predicate = compile_filter(filter_query)
+        matched = [fact for fact in facts if predicate(fact)]
+
+        skip = int(query.get("$skip", 0))
+        top = query.get("$top")
+        max_page_size = self.config["max_page_size"]
+        page_size = min(int(top), max_page_size) if top else max_page_size
+        page = matched[skip : skip + page_size]
+
+        select = query.get("$select")
+        if select:
+            columns = select.split(",")
+            page = [{column: fact.get(column) for column in columns} for fact in page]
+
+        payload = {"@odata.context": f"{self.base_url}$metadata#{indicator_code}"}
+        if query.get("$count") == "true":
+            payload["@odata.count"] = len(matched)
+        payload["value"] = page
+
+        # Server-driven paging: only when the server capped the client's request
+        requested = int(top) if top else len(matched) - skip
+        if page_size < requested and skip + page_size < len(matched):
+            next_query = dict(query, **{"$skip": skip + page_size})
+            if top:
+                next_query["$top"] = int(top) - page_size
+            payload["@odata.nextLink"] = (
+                f"{self.base_url}{indicator_code}?{urlencode(next_query)}"
+            )
+        return 200, payload
+
+    def create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, payload, etag=None):
+                body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if etag:
+                    self.send_header("ETag", etag)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body, compresslevel=5)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                started = time.time()
+                time.sleep(server.config["latency_ms"] / 1000)
+
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                path_parts = url.path.strip("/").split("/")[1:]
+                indicator_code = path_parts[-1] if path_parts else ""
+                metadata = generate_synthetic_metadata(path_parts)
+
+                if random.random() < server.config["error_rate"]:
+                    status, payload, etag = 503, {"error": "Injected failure"}, None
+                elif metadata is not None:
+                    status, payload, etag = 200, {"value": metadata}, None
+                else:
+                    try:
+                        status, payload = server.handle_query(indicator_code, query)
+                    except ValueError as e:
+                        status, payload = 400, {"error": str(e)}
+                    etag = None
+                    if status == 200:
+                        digest = hashlib.sha1(
+                            json.dumps(payload, sort_keys=True).encode("utf-8")
+                        ).hexdigest()
+                        etag = f'W/"{digest}"'
+                        if self.headers.get("If-None-Match") == etag:
+                            status = 304
+
+                if status == 304:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                else:
+                    self.send_json(status, payload, etag)
+
+                server.request_log.append(
+                    {
+                        "path": self.path,
+                        "status": status,
+                        "duration_ms": round((time.time() - started) * 1000, 1),
+                    }
+                )
+
+        return Handler
+
+    def start(self, background=True):
+        self.httpd = ThreadingHTTPServer(
+            (self.config["host"], self.config["port"]), self.create_handler()
+        )
+        self.httpd.daemon_threads = True
+        print(f"{Fore.GREEN}GHO stand-in ({self.mode}) serving on {self.base_url}")
+        if background:
+            self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            self.thread.start()
+        else:
+            self.httpd.serve_forever()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+if __name__ == "__main__":
+    # Usage: python3 utils/gho_standin_server.py [synthetic|record|replay]
+    overrides = {"mode": sys.argv[1]} if len(sys.argv) > 1 else {}
+    server = GhoStandinServer(overrides)
+    try:
+        server.start(background=False)
+    except KeyboardInterrupt:
+        server.stop()